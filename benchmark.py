@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Benchmark the applicant pipeline against local stand-ins for Airtable and Gemini.
+
+Each dataset size runs in its own process against a fake_airtable.py server
+seeded with that many synthetic applicants, using the fake LLM backend, so
+peak RSS is measured per size. Results are saved as JSON so runs can be
+compared between commits:
+
+    python benchmark.py --sizes 100 1000 --output before.json
+    python benchmark.py --sizes 100 1000 --output after.json --compare before.json
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import socket
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASE_ID = 'appBenchmark'
+STAGES = ('compress', 'shortlist', 'llm', 'write')
+
+
+class LatencyRecorder:
+    """Collects durations per label and summarises them as percentiles"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def add(self, label: str, seconds: float):
+        self.samples.setdefault(label, []).append(seconds)
+
+    def wrap(self, label: str, func: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(label, time.perf_counter() - start)
+        return timed
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {label: summarize(samples) for label, samples in sorted(self.samples.items())}
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        'count': len(ordered),
+        'p50_ms': round(percentile(ordered, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 3),
+        'total_s': round(sum(ordered), 3)
+    }
+
+
+def peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_one(args) -> Dict:
+    """Benchmark one dataset size in this process; the fake server is already running"""
+    workdir = tempfile.mkdtemp(prefix='mercor-bench-')
+    os.environ.update({
+        'AIRTABLE_API_ROOT': args.api_root,
+        'AIRTABLE_BASE_ID': BASE_ID,
+        'AIRTABLE_TOKEN': 'benchmark',
+        'LLM_BACKEND': 'fake',
+        'LLM_CACHE_PATH': os.path.join(workdir, 'llm_cache.sqlite3'),
+        'RUN_STATE_PATH': os.path.join(workdir, 'run_state.sqlite3')
+    })
+    sys.path.insert(0, HERE)
+    os.chdir(workdir)  # keeps main.py's log file out of the repo
+
+    import main
+    logging.getLogger().setLevel(logging.WARNING)
+
+    main.SYSTEM_SETTINGS['airtable_requests_per_second'] = args.airtable_rps
+    main.SYSTEM_SETTINGS['llm_requests_per_minute'] = 10 ** 9
+    if args.concurrency:
+        main.SYSTEM_SETTINGS['llm_concurrency'] = args.concurrency
+    main.LLM_BACKEND_SETTINGS.update(
+        fake_latency_ms=args.llm_latency_ms,
+        fake_error_rate=args.llm_error_rate,
+        fake_malformed_rate=args.llm_malformed_rate
+    )
+
+    system = main.MercorAirtableSystem()
+
+    http = LatencyRecorder()
+    send = system.session.request
+    system.session.request = lambda method, url, **kwargs: http.wrap(method.upper(), send)(method, url, **kwargs)
+
+    stages = LatencyRecorder()
+    for stage in STAGES:
+        attribute = f"_{stage}_stage"
+        setattr(system, attribute, stages.wrap(stage, getattr(system, attribute)))
+
+    start = time.perf_counter()
+    results = system.process_all_applicants()
+    elapsed = time.perf_counter() - start
+    batch_http = http.summary()
+    http_calls = sum(s['count'] for s in batch_http.values())
+
+    # Single-applicant paths, as used by the menu and CLI outside batch runs
+    operations = LatencyRecorder()
+    sample = [f"APP-{i + 1:06d}" for i in range(0, args.applicants, max(1, args.applicants // args.sample))]
+    for applicant_id in sample[:args.sample]:
+        operations.wrap('get_applicant_data', system.get_applicant_data)(applicant_id)
+        compressed_json = json.dumps(operations.wrap('compress_to_json', system.compress_to_json)(applicant_id))
+        operations.wrap('evaluate_shortlist_criteria', system.evaluate_shortlist_criteria)(compressed_json)
+        operations.wrap('decompress_from_json', system.decompress_from_json)(applicant_id, compressed_json)
+
+    return {
+        'applicants': args.applicants,
+        'seconds': round(elapsed, 3),
+        'applicants_per_second': round(args.applicants / elapsed, 2) if elapsed else None,
+        'http_calls': http_calls,
+        'http_calls_per_applicant': round(http_calls / args.applicants, 4),
+        'http_latency': batch_http,
+        'stage_latency': stages.summary(),
+        'operation_latency': operations.summary(),
+        'peak_rss_mb': peak_rss_mb(),
+        'results': results
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_airtable(args, applicants: int) -> tuple:
+    port = free_port()
+    server = subprocess.Popen([
+        sys.executable, os.path.join(HERE, 'fake_airtable.py'), '--port', str(port),
+        '--applicants', str(applicants), '--seed', str(args.seed),
+        '--latency-ms', str(args.airtable_latency_ms), '--jitter-ms', str(args.airtable_jitter_ms),
+        '--error-429-rate', str(args.airtable_429_rate), '--retry-after', '0.1'
+    ], stdout=subprocess.DEVNULL)
+
+    api_root = f"http://127.0.0.1:{port}/v0"
+    deadline = time.monotonic() + 60 + applicants / 1000
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("fake_airtable.py exited during startup")
+        try:
+            requests.get(f"{api_root}/{BASE_ID}/Applicants", params={'pageSize': 1}, timeout=1)
+            return server, api_root
+        except requests.RequestException:
+            time.sleep(0.2)
+
+    server.kill()
+    raise RuntimeError(f"fake_airtable.py did not start within the deadline for {applicants} applicants")
+
+
+def run_size(args, applicants: int) -> Dict:
+    """Start a seeded fake server and benchmark one size in a child process"""
+    server, api_root = start_fake_airtable(args, applicants)
+    try:
+        command = [sys.executable, os.path.abspath(__file__), '--run-one', '--applicants', str(applicants),
+                   '--api-root', api_root] + forwarded_options(args)
+        child = subprocess.run(command, stdout=subprocess.PIPE, text=True)
+        if child.returncode != 0:
+            raise RuntimeError(f"benchmark of {applicants} applicants failed with exit code {child.returncode}")
+        return json.loads(child.stdout.strip().splitlines()[-1])
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def forwarded_options(args) -> List[str]:
+    options = ['--airtable-rps', str(args.airtable_rps), '--llm-latency-ms', str(args.llm_latency_ms),
+               '--llm-error-rate', str(args.llm_error_rate), '--llm-malformed-rate', str(args.llm_malformed_rate),
+               '--sample', str(args.sample)]
+    if args.concurrency:
+        options += ['--concurrency', str(args.concurrency)]
+    return options
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: Dict, baseline: Dict = None):
+    previous = {run['applicants']: run for run in (baseline or {}).get('runs', [])}
+    print(f"\n{'applicants':>10} {'apps/sec':>10} {'http/app':>9} {'peak MB':>8}  stage p95 ms")
+    for run in report['runs']:
+        stage_p95 = ' '.join(f"{name}={stats['p95_ms']:.1f}" for name, stats in run['stage_latency'].items())
+        print(f"{run['applicants']:>10} {run['applicants_per_second']:>10} {run['http_calls_per_applicant']:>9} "
+              f"{run['peak_rss_mb']:>8}  {stage_p95}")
+
+        before = previous.get(run['applicants'])
+        if before:
+            def change(key):
+                old, new = before[key], run[key]
+                return f"{(new - old) / old * 100:+.1f}%" if old else 'n/a'
+            print(f"{'vs ' + str(baseline.get('commit')):>10} {change('applicants_per_second'):>10} "
+                  f"{change('http_calls_per_applicant'):>9} {change('peak_rss_mb'):>8}")
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the applicant pipeline against local fakes")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000],
+                        help='dataset sizes in applicants')
+    parser.add_argument('--output', default='benchmark_results.json', help='where to save the JSON report')
+    parser.add_argument('--compare', metavar='PATH', help='earlier report to compare against')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sample', type=int, default=50,
+                        help='applicants timed through the single-applicant operations')
+    parser.add_argument('--concurrency', type=int, help='parallel LLM evaluations')
+    parser.add_argument('--airtable-latency-ms', type=float, default=20)
+    parser.add_argument('--airtable-jitter-ms', type=float, default=10)
+    parser.add_argument('--airtable-429-rate', type=float, default=0)
+    parser.add_argument('--airtable-rps', type=float, default=1000,
+                        help="client-side Airtable rate limit (the real API allows 5)")
+    parser.add_argument('--llm-latency-ms', type=float, default=50, help='mean fake LLM latency')
+    parser.add_argument('--llm-error-rate', type=float, default=0)
+    parser.add_argument('--llm-malformed-rate', type=float, default=0)
+    parser.add_argument('--run-one', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--applicants', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--api-root', help=argparse.SUPPRESS)
+    return parser
+
+
+def main():
+    args = build_arg_parser().parse_args()
+
+    if args.run_one:
+        print(json.dumps(run_one(args)))
+        return 0
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'options': {key: value for key, value in vars(args).items()
+                    if key not in ('run_one', 'applicants', 'api_root', 'output', 'compare')},
+        'runs': []
+    }
+
+    for applicants in args.sizes:
+        print(f"Benchmarking {applicants} applicants...")
+        report['runs'].append(run_size(args, applicants))
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    print_report(report, baseline)
+    print(f"\nSaved results to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
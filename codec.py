@@ -0,0 +1,133 @@
+import json
+from typing import Any, Dict, List, TypedDict, Union
+
+try:
+    import orjson
+except ImportError:  # optional: msgspec or the standard library produce the same text
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    BACKEND = 'orjson'
+elif msgspec is not None:
+    BACKEND = 'msgspec'
+else:
+    BACKEND = 'json'
+
+
+class PersonalInfo(TypedDict, total=False):
+    name: str
+    email: str
+    location: str
+    linkedin: str
+
+
+class Role(TypedDict, total=False):
+    company: str
+    title: str
+    start: str
+    end: str
+    technologies: str
+
+
+class SalaryInfo(TypedDict, total=False):
+    preferred_rate: float
+    minimum_rate: float
+    currency: str
+    availability: float
+
+
+class Profile(TypedDict, total=False):
+    """Compressed JSON of an applicant, as built by compress_to_json"""
+    personal: PersonalInfo
+    experience: List[Role]
+    salary: SalaryInfo
+
+
+class ProfileError(ValueError):
+    """Compressed JSON that doesn't match the profile schema"""
+
+
+NUMBER = (int, float)
+
+# Expected type of each known key; unknown keys are allowed and left alone
+PERSONAL_SCHEMA = {'name': str, 'email': str, 'location': str, 'linkedin': str}
+ROLE_SCHEMA = {'company': str, 'title': str, 'start': str, 'end': str, 'technologies': (str, list)}
+SALARY_SCHEMA = {'preferred_rate': NUMBER, 'minimum_rate': NUMBER, 'currency': str, 'availability': NUMBER}
+
+
+def _stdlib_dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def dumps(value: Any) -> str:
+    """Canonical JSON text: sorted keys, no whitespace, non-ASCII left as is
+
+    Equal values always encode to the same text, whichever backend is
+    installed, so the output can be hashed and compared byte for byte. The
+    exception is floats past 1e16 or below 1e-4, and NaN, which backends
+    spell differently; profiles never hold those.
+    """
+    try:
+        if orjson is not None:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS).decode('utf-8')
+        if msgspec is not None:
+            return msgspec.json.encode(value, order='sorted').decode('utf-8')
+    except (TypeError, ValueError, OverflowError):
+        pass  # e.g. integers beyond 64 bits, which the standard library handles
+    return _stdlib_dumps(value)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON text or UTF-8 bytes; raises ValueError on invalid input"""
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(data)
+
+
+def canonical(text: Union[str, bytes]) -> str:
+    """Re-encode JSON text in the canonical form of dumps()"""
+    return dumps(loads(text))
+
+
+def _check(values: Any, schema: Dict[str, Any], path: str):
+    if not isinstance(values, dict):
+        raise ProfileError(f"{path}: expected an object, got {type(values).__name__}")
+    for key, expected in schema.items():
+        if key not in values:
+            continue
+        value = values[key]
+        # bool is an int subclass, but never a valid rate or availability
+        if not isinstance(value, expected) or (expected is NUMBER and isinstance(value, bool)):
+            raise ProfileError(f"{path}.{key}: unexpected {type(value).__name__} {value!r}")
+
+
+def decode_profile(text: Union[str, bytes]) -> Profile:
+    """Parse Compressed JSON, checking every known field has the type compress_to_json writes
+
+    Sections and fields may be missing, since readers fall back to defaults,
+    but a present field of the wrong type raises ProfileError naming it.
+    """
+    data = loads(text)
+    if not isinstance(data, dict):
+        raise ProfileError(f"profile: expected an object, got {type(data).__name__}")
+
+    if 'personal' in data:
+        _check(data['personal'], PERSONAL_SCHEMA, 'personal')
+    if 'salary' in data:
+        _check(data['salary'], SALARY_SCHEMA, 'salary')
+    if 'experience' in data:
+        if not isinstance(data['experience'], list):
+            raise ProfileError(f"experience: expected a list, got {type(data['experience']).__name__}")
+        for index, role in enumerate(data['experience']):
+            _check(role, ROLE_SCHEMA, f"experience[{index}]")
+    return data
@@ -27,11 +27,22 @@ TABLE_NAMES = {
 # Gemini AI Configuration
 GEMINI_CONFIG = {
     'api_key': os.getenv('GEMINI_API_KEY'),
-    'model': 'gemini-pro',
+    # gemini-pro has been retired and now answers every request with a 404
+    'model': os.getenv('GEMINI_MODEL', 'gemini-1.5-flash'),
     'max_retries': 3,
     'timeout': 30
 }
 
+# LLM backend selection; 'fake' answers locally for benchmarks and load tests
+LLM_BACKEND_SETTINGS = {
+    'backend': os.getenv('LLM_BACKEND', 'gemini'),  # 'gemini' or 'fake'
+    'fake_latency_ms': 800,
+    'fake_latency_distribution': 'lognormal',  # fixed, uniform, exponential or lognormal
+    'fake_error_rate': 0.0,
+    'fake_malformed_rate': 0.0,
+    'fake_seed': 0
+}
+
 # Shortlisting Criteria
 SHORTLIST_CRITERIA = {
     'tier1_companies': [
@@ -55,7 +66,50 @@ SYSTEM_SETTINGS = {
     'log_level': 'INFO',
     'log_file': 'mercor_system.log',
     'batch_size': 10,
-    'rate_limit_delay': 0.5  # seconds between API calls
+    'rate_limit_delay': 0.5,  # base backoff after a 429 without Retry-After
+    'airtable_requests_per_second': 5,  # Airtable's per-base limit
+    'max_throttle_retries': 5,
+    'connect_timeout': 5,  # seconds to establish a connection
+    'read_timeout': 30,  # seconds to wait for a response
+    'pool_connections': 10,
+    'pool_maxsize': 20,
+    'llm_concurrency': 4,  # parallel Gemini calls in batch runs
+    'llm_requests_per_minute': 60,
+    'pipeline_queue_size': 100,  # applicants buffered between batch pipeline stages
+    'listing_concurrency': 5,  # tables (or filtered listings) downloaded in parallel
+    'listing_prefetch_pages': 4  # pages fetched ahead of the code consuming them
+}
+
+# LLM Evaluation Cache
+LLM_CACHE_SETTINGS = {
+    'enabled': True,
+    'path': os.getenv('LLM_CACHE_PATH', 'llm_cache.sqlite3'),
+    'max_entries': 100000,
+    'max_age_days': 30
+}
+
+# Batch Run State (incremental marks, shard leases, checkpoint journal)
+RUN_STATE_SETTINGS = {
+    'path': os.getenv('RUN_STATE_PATH', 'run_state.sqlite3'),
+    'incremental_overlap_seconds': 60,  # re-check this much before the last mark
+    'lease_ttl_seconds': 900,  # a crashed shard worker's applicants free up after this
+    'commit_interval': 100  # applicants between write flushes that journal checkpoints and release leases
+}
+
+# Local read replica of the Airtable tables (writes still go to Airtable)
+REPLICA_SETTINGS = {
+    'enabled': os.getenv('REPLICA_ENABLED', '').lower() in ('1', 'true', 'yes'),
+    'path': os.getenv('REPLICA_PATH', 'replica.sqlite3'),
+    'max_staleness_seconds': 300,  # reads trigger an incremental sync of tables checked longer ago
+    'sync_overlap_seconds': 60,  # re-fetch this much before the last sync to absorb clock skew
+    'full_sync_hours': 24  # full re-download, which is how rows deleted elsewhere disappear
+}
+
+# Metrics export (Prometheus text format); both are off when empty/0
+METRICS_SETTINGS = {
+    'textfile_path': os.getenv('METRICS_TEXTFILE', ''),  # rewritten after every batch run
+    'http_port': int(os.getenv('METRICS_PORT', '0')),  # serves /metrics while the process runs
+    'http_host': os.getenv('METRICS_HOST', '127.0.0.1')  # 0.0.0.0 lets other hosts scrape it
 }
 
 # LLM Prompt Templates
@@ -120,9 +174,10 @@ def validate_config():
     """Validate that all required configuration is present"""
     required_env_vars = [
         'AIRTABLE_TOKEN',
-        'AIRTABLE_BASE_ID', 
-        'GEMINI_API_KEY'
+        'AIRTABLE_BASE_ID'
     ]
+    if LLM_BACKEND_SETTINGS['backend'] == 'gemini':
+        required_env_vars.append('GEMINI_API_KEY')
     
     missing_vars = [var for var in required_env_vars if not os.getenv(var)]
     
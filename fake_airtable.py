@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Airtable REST API, for offline load testing.
+
+Implements the parts of the API the system uses: paginated list with
+offset, fields[] and a filterByFormula subset, single-record get, and
+create/update/delete of single records or batches of up to 10. Latency
+and 429 responses can be injected, and the base is seeded with
+synthetic applicants at any scale.
+
+Point the system at it with AIRTABLE_API_ROOT, e.g.:
+    python fake_airtable.py --applicants 10000 --port 8765
+    AIRTABLE_API_ROOT=http://127.0.0.1:8765/v0 python main.py stats
+"""
+
+import re
+import sys
+import gzip
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import datetime, timezone, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse, parse_qs, unquote
+
+MAX_PAGE_SIZE = 100
+MAX_BATCH_SIZE = 10
+
+FIRST_NAMES = ['Ava', 'Ben', 'Chen', 'Diego', 'Emma', 'Farah', 'Hiro', 'Isla', 'Jonas', 'Lena', 'Maya', 'Omar']
+LAST_NAMES = ['Garcia', 'Ito', 'Khan', 'Muller', 'Novak', 'Okafor', 'Patel', 'Rossi', 'Silva', 'Smith']
+LOCATIONS = ['San Francisco, US', 'New York, USA', 'Toronto, Canada', 'London, UK', 'Berlin, Germany',
+             'Bangalore, India', 'Sydney, Australia', 'Paris, France', 'Sao Paulo, Brazil', 'Lagos, Nigeria']
+COMPANIES = ['Google', 'Meta', 'Stripe', 'Microsoft', 'Amazon', 'Acme Corp', 'Initech', 'Globex',
+             'Umbrella Labs', 'Hooli', 'Vandelay Industries', 'Soylent']
+TITLES = ['Software Engineer', 'Senior Engineer', 'Data Scientist', 'ML Engineer', 'Product Manager',
+          'Designer', 'DevOps Engineer']
+TECHNOLOGIES = ['Python', 'Go', 'TypeScript', 'React', 'PostgreSQL', 'Kubernetes', 'PyTorch', 'AWS', 'Rust']
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+
+class FormulaError(ValueError):
+    pass
+
+
+class Formula:
+    """Parser and evaluator for the filterByFormula subset the system sends
+
+    Supports string literals, {Field} references, the &, = and != operators, and
+    OR, AND, NOT, FIND, ARRAYJOIN, IS_AFTER, DATETIME_PARSE and
+    LAST_MODIFIED_TIME.
+    """
+
+    TOKEN = re.compile(r"\s*(?:(?P<string>'(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\")|(?P<field>\{[^}]*\})"
+                       r"|(?P<number>\d+(?:\.\d+)?)|(?P<name>[A-Z_]+)|(?P<op>!=|[(),&=]))")
+
+    def __init__(self, source: str):
+        self.tokens = []
+        position = 0
+        source = source.strip()
+        while position < len(source):
+            match = self.TOKEN.match(source, position)
+            if not match:
+                raise FormulaError(f"Unexpected input at {position}: {source[position:position + 20]!r}")
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(kind)))
+            position = match.end()
+        self.index = 0
+        self.tree = self._comparison()
+        if self.index != len(self.tokens):
+            raise FormulaError("Unexpected trailing tokens")
+
+    def _peek(self) -> Optional[tuple]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def _take(self, value: str = None) -> tuple:
+        token = self._peek()
+        if token is None or (value is not None and token[1] != value):
+            raise FormulaError(f"Expected {value or 'token'}, got {token}")
+        self.index += 1
+        return token
+
+    def _comparison(self):
+        left = self._concat()
+        if self._peek() in (('op', '='), ('op', '!=')):
+            operator = self._take()[1]
+            return (operator, left, self._concat())
+        return left
+
+    def _concat(self):
+        node = self._atom()
+        while self._peek() == ('op', '&'):
+            self._take('&')
+            node = ('&', node, self._atom())
+        return node
+
+    def _atom(self):
+        kind, value = self._take()
+        if kind == 'string':
+            return ('literal', re.sub(r"\\(.)", r"\1", value[1:-1]))
+        if kind == 'number':
+            return ('literal', float(value))
+        if kind == 'field':
+            return ('field', value[1:-1])
+        if kind == 'op' and value == '(':
+            node = self._comparison()
+            self._take(')')
+            return node
+        if kind == 'name':
+            self._take('(')
+            args = []
+            if self._peek() != ('op', ')'):
+                args.append(self._comparison())
+                while self._peek() == ('op', ','):
+                    self._take(',')
+                    args.append(self._comparison())
+            self._take(')')
+            return ('call', value, args)
+        raise FormulaError(f"Unexpected token {value!r}")
+
+    def matches(self, record: 'FakeRecord') -> bool:
+        return bool(self._eval(self.tree, record))
+
+    def _eval(self, node, record: 'FakeRecord') -> Any:
+        kind = node[0]
+        if kind == 'literal':
+            return node[1]
+        if kind == 'field':
+            value = record.fields.get(node[1])
+            return '' if value is None else value
+        if kind == '&':
+            return self._text(self._eval(node[1], record)) + self._text(self._eval(node[2], record))
+        if kind in ('=', '!='):
+            left, right = self._eval(node[1], record), self._eval(node[2], record)
+            if isinstance(left, list):
+                left = ', '.join(map(str, left))
+            return (left == right) == (kind == '=')
+
+        name, args = node[1], node[2]
+        if name == 'LAST_MODIFIED_TIME':
+            fields = [arg[1] for arg in args if arg[0] == 'field']
+            return record.last_modified(fields)
+        values = [self._eval(arg, record) for arg in args]
+        if name == 'OR':
+            return any(values)
+        if name == 'AND':
+            return all(values)
+        if name == 'NOT':
+            return not values[0]
+        if name == 'ARRAYJOIN':
+            separator = values[1] if len(values) > 1 else ', '
+            items = values[0] if isinstance(values[0], list) else [values[0]]
+            return separator.join(self._text(item) for item in items)
+        if name == 'FIND':
+            start = int(values[2]) - 1 if len(values) > 2 else 0
+            return self._text(values[1]).find(self._text(values[0]), start) + 1
+        if name == 'DATETIME_PARSE':
+            return self._datetime(values[0])
+        if name == 'IS_AFTER':
+            return self._datetime(values[0]) > self._datetime(values[1])
+        raise FormulaError(f"Unsupported function {name}")
+
+    @staticmethod
+    def _text(value) -> str:
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return '' if value is None else str(value)
+
+    @staticmethod
+    def _datetime(value) -> datetime:
+        if isinstance(value, datetime):
+            return value
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+
+
+class FakeRecord:
+    def __init__(self, record_id: str, fields: Dict):
+        self.id = record_id
+        self.created = now_iso()
+        self.fields: Dict = {}
+        self.modified: Dict[str, str] = {}
+        self.update(fields)
+
+    def update(self, fields: Dict, replace: bool = False):
+        stamp = now_iso()
+        if replace:
+            for name in set(self.fields) - set(fields):
+                self.modified[name] = stamp
+            self.fields = {}
+        for name, value in fields.items():
+            if self.fields.get(name) != value:
+                self.modified[name] = stamp
+            self.fields[name] = value
+
+    def last_modified(self, fields: List[str]) -> datetime:
+        stamps = [self.modified[f] for f in (fields or self.modified) if f in self.modified]
+        return Formula._datetime(max(stamps) if stamps else self.created)
+
+    def to_json(self, projection: List[str] = None) -> Dict:
+        # Airtable omits empty values from responses
+        fields = {name: value for name, value in self.fields.items()
+                  if value not in ('', None, [], False) and (not projection or name in projection)}
+        return {'id': self.id, 'createdTime': self.created, 'fields': fields}
+
+
+class FakeAirtable:
+    """In-memory base with request accounting and fault injection"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_429_rate: float = 0,
+                 retry_after: float = 1, requests_per_second: float = 0, seed: int = 0):
+        self.tables: Dict[str, Dict[str, FakeRecord]] = {}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_429_rate = error_429_rate
+        self.retry_after = retry_after
+        self.requests_per_second = requests_per_second
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self._next_id = 0
+        self._recent: List[float] = []
+        # Listing iterators by offset token, like Airtable's itr... offsets
+        self._iterators: Dict[str, List[str]] = {}
+        self._iterator_count = 0
+        self.stats = {'requests': 0, 'throttled': 0, 'bytes_sent': 0, 'by_method': {}, 'by_table': {}}
+
+    def new_id(self) -> str:
+        self._next_id += 1
+        return f"rec{self._next_id:014d}"
+
+    def table(self, name: str) -> Dict[str, FakeRecord]:
+        return self.tables.setdefault(name, {})
+
+    def insert(self, table_name: str, fields: Dict) -> FakeRecord:
+        record = FakeRecord(self.new_id(), fields)
+        self.table(table_name)[record.id] = record
+        return record
+
+    def seed_applicants(self, count: int, seed: int = 0):
+        """Fill the five tables with count synthetic applicants"""
+        rng = random.Random(seed)
+        for table_name in ('Applicants', 'Personal Details', 'Work Experience', 'Salary Preferences',
+                           'Shortlisted Leads'):
+            self.table(table_name)
+
+        for i in range(count):
+            applicant_id = f"APP-{i + 1:06d}"
+            self.insert('Applicants', {'Applicant ID': applicant_id, 'Shortlist Status': 'Pending'})
+
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            self.insert('Personal Details', {
+                'Applicant ID': [applicant_id],
+                'Full Name': f"{first} {last}",
+                'Email': f"{first.lower()}.{last.lower()}{i}@example.com",
+                'Location': rng.choice(LOCATIONS),
+                'LinkedIn': f"https://linkedin.com/in/{first.lower()}{last.lower()}{i}"
+            })
+
+            end = datetime(2025, 1, 1) - timedelta(days=rng.randint(0, 900))
+            for job in range(rng.randint(1, 4)):
+                start = end - timedelta(days=rng.randint(200, 1500))
+                self.insert('Work Experience', {
+                    'Applicant ID': [applicant_id],
+                    'Company': rng.choice(COMPANIES),
+                    'Title': rng.choice(TITLES),
+                    'Start Date': start.strftime('%Y-%m-%d'),
+                    'End Date': 'Present' if job == 0 and rng.random() < 0.4 else end.strftime('%Y-%m-%d'),
+                    'Technologies': ', '.join(rng.sample(TECHNOLOGIES, 3))
+                })
+                end = start - timedelta(days=rng.randint(0, 120))
+
+            preferred = rng.choice([40, 60, 75, 90, 100, 120, 150])
+            self.insert('Salary Preferences', {
+                'Applicant ID': [applicant_id],
+                'Preferred Rate': preferred,
+                'Minimum Rate': int(preferred * 0.8),
+                'Currency': 'USD',
+                'Availability': rng.choice([10, 15, 20, 25, 30, 40])
+            })
+
+    def admit(self) -> bool:
+        """Decide whether to throttle this request with a 429"""
+        with self.lock:
+            self.stats['requests'] += 1
+            if self.requests_per_second:
+                now = time.monotonic()
+                self._recent = [t for t in self._recent if now - t < 1.0]
+                if len(self._recent) >= self.requests_per_second:
+                    self.stats['throttled'] += 1
+                    return False
+                self._recent.append(now)
+            if self.error_429_rate and self.random.random() < self.error_429_rate:
+                self.stats['throttled'] += 1
+                return False
+        return True
+
+    def delay(self):
+        if self.latency_ms or self.jitter_ms:
+            with self.lock:
+                jitter = self.random.uniform(0, self.jitter_ms)
+            time.sleep((self.latency_ms + jitter) / 1000.0)
+
+    def count(self, method: str, table_name: str, sent: int):
+        with self.lock:
+            self.stats['by_method'][method] = self.stats['by_method'].get(method, 0) + 1
+            self.stats['by_table'][table_name] = self.stats['by_table'].get(table_name, 0) + 1
+            self.stats['bytes_sent'] += sent
+
+    def handle(self, method: str, table_name: str, record_id: Optional[str], query: Dict[str, List[str]],
+               body: Optional[Dict]) -> tuple:
+        """Apply one API call; returns (status, payload)"""
+        with self.lock:
+            if table_name not in self.tables:
+                return 404, {'error': 'TABLE_NOT_FOUND'}
+            table = self.tables[table_name]
+
+            if method == 'GET' and record_id:
+                if record_id not in table:
+                    return 404, {'error': 'NOT_FOUND'}
+                return 200, table[record_id].to_json()
+
+            if method == 'GET':
+                return self._list(table, query)
+
+            if method == 'DELETE':
+                record_ids = [record_id] if record_id else query.get('records[]', [])
+                if len(record_ids) > MAX_BATCH_SIZE:
+                    return 422, {'error': {'type': 'INVALID_REQUEST_UNKNOWN',
+                                           'message': f"At most {MAX_BATCH_SIZE} records per request"}}
+                if any(r not in table for r in record_ids):
+                    return 404, {'error': 'NOT_FOUND'}
+                for r in record_ids:
+                    del table[r]
+                if record_id:
+                    return 200, {'id': record_id, 'deleted': True}
+                return 200, {'records': [{'id': r, 'deleted': True} for r in record_ids]}
+
+            body = body or {}
+            batch = 'records' in body
+            items = body['records'] if batch else [dict(body, id=record_id)]
+            if len(items) > MAX_BATCH_SIZE:
+                return 422, {'error': {'type': 'INVALID_REQUEST_UNKNOWN',
+                                       'message': f"At most {MAX_BATCH_SIZE} records per request"}}
+
+            if method == 'POST':
+                records = []
+                for item in items:
+                    record = FakeRecord(self.new_id(), item.get('fields', {}))
+                    table[record.id] = record
+                    records.append(record)
+            elif method in ('PATCH', 'PUT'):
+                if any(item.get('id') not in table for item in items):
+                    return 404, {'error': 'NOT_FOUND'}
+                records = []
+                for item in items:
+                    record = table[item['id']]
+                    record.update(item.get('fields', {}), replace=method == 'PUT')
+                    records.append(record)
+            else:
+                return 405, {'error': 'METHOD_NOT_ALLOWED'}
+
+            if batch:
+                return 200, {'records': [r.to_json() for r in records]}
+            return 200, records[0].to_json()
+
+    def _list(self, table: Dict[str, FakeRecord], query: Dict[str, List[str]]) -> tuple:
+        page_size = min(int(query.get('pageSize', [MAX_PAGE_SIZE])[0]), MAX_PAGE_SIZE)
+        projection = query.get('fields[]')
+        offset = query.get('offset', [''])[0]
+
+        if offset:
+            # The matching IDs are fixed when the listing starts, so paging costs O(page)
+            iterator, _, start = offset.partition('/')
+            if iterator not in self._iterators or not start.isdigit():
+                return 422, {'error': {'type': 'LIST_RECORDS_ITERATOR_NOT_AVAILABLE'}}
+            record_ids, start = self._iterators[iterator], int(start)
+        else:
+            records = table.values()
+            formula = query.get('filterByFormula', [''])[0]
+            if formula:
+                try:
+                    parsed = Formula(formula)
+                except FormulaError as e:
+                    return 422, {'error': {'type': 'INVALID_FILTER_BY_FORMULA', 'message': str(e)}}
+                records = [r for r in records if parsed.matches(r)]
+            record_ids, start = [r.id for r in records], 0
+            self._iterator_count += 1
+            iterator = f"itr{self._iterator_count}"
+
+        page = [table[r] for r in record_ids[start:start + page_size] if r in table]
+        payload = {'records': [r.to_json(projection) for r in page]}
+        if start + page_size < len(record_ids):
+            self._iterators[iterator] = record_ids
+            payload['offset'] = f"{iterator}/{start + page_size}"
+        else:
+            self._iterators.pop(iterator, None)
+        return 200, payload
+
+
+def make_handler(base: FakeAirtable):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _dispatch(self, method: str):
+            parsed = urlparse(self.path)
+            parts = [unquote(p) for p in parsed.path.strip('/').split('/')]
+            length = int(self.headers.get('Content-Length') or 0)
+            raw = self.rfile.read(length) if length else b''
+
+            if len(parts) < 3 or parts[0] != 'v0':
+                return self._send(404, {'error': 'NOT_FOUND'}, '')
+
+            table_name = parts[2]
+            record_id = parts[3] if len(parts) > 3 else None
+
+            base.delay()
+            if not base.admit():
+                return self._send(429, {'errors': [{'error': 'RATE_LIMIT_REACHED'}]}, table_name,
+                                  {'Retry-After': str(base.retry_after)})
+
+            try:
+                body = json.loads(raw) if raw else None
+            except ValueError:
+                return self._send(422, {'error': 'INVALID_JSON'}, table_name)
+
+            status, payload = base.handle(method, table_name, record_id, parse_qs(parsed.query), body)
+            self._send(status, payload, table_name)
+
+        def _send(self, status: int, payload: Dict, table_name: str, headers: Dict = None):
+            data = json.dumps(payload).encode('utf-8')
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                data = gzip.compress(data, compresslevel=1)
+                headers = dict(headers or {}, **{'Content-Encoding': 'gzip'})
+
+            base.count(self.command, table_name, len(data))
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._dispatch('GET')
+
+        def do_POST(self):
+            self._dispatch('POST')
+
+        def do_PATCH(self):
+            self._dispatch('PATCH')
+
+        def do_PUT(self):
+            self._dispatch('PUT')
+
+        def do_DELETE(self):
+            self._dispatch('DELETE')
+
+    return Handler
+
+
+class FakeAirtableServer:
+    """Run a FakeAirtable on a background thread"""
+
+    def __init__(self, base: FakeAirtable, host: str = '127.0.0.1', port: int = 0):
+        self.base = base
+        self.httpd = ThreadingHTTPServer((host, port), make_handler(base))
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='fake-airtable', daemon=True)
+
+    @property
+    def api_root(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v0"
+
+    def start(self) -> 'FakeAirtableServer':
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake Airtable API for load testing")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--applicants', type=int, default=1000, help='synthetic applicants to seed')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=0, help='fixed delay added to every response')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='random extra delay up to this much')
+    parser.add_argument('--error-429-rate', type=float, default=0, help='fraction of requests answered 429')
+    parser.add_argument('--requests-per-second', type=float, default=0,
+                        help="answer 429 above this rate, like Airtable's per-base limit (0 = unlimited)")
+    parser.add_argument('--retry-after', type=float, default=1, help='Retry-After seconds on injected 429s')
+    args = parser.parse_args()
+
+    base = FakeAirtable(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_429_rate=args.error_429_rate,
+                        retry_after=args.retry_after, requests_per_second=args.requests_per_second, seed=args.seed)
+    base.seed_applicants(args.applicants, seed=args.seed)
+
+    server = FakeAirtableServer(base, args.host, args.port)
+    print(f"Fake Airtable serving {args.applicants} applicants at {server.api_root}/<base id>")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nRequest stats: {json.dumps(base.stats)}")
+        server.httpd.server_close()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
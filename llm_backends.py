@@ -0,0 +1,135 @@
+import time
+import random
+import hashlib
+import logging
+import threading
+from typing import Dict
+
+
+class LLMError(Exception):
+    """A failed generation that is worth retrying"""
+
+
+class LLMPermanentError(LLMError):
+    """A failed generation that will fail the same way on every retry (bad model, key or request)"""
+
+
+class LLMBackend:
+    """Turns a prompt into response text
+
+    name identifies the model behind the backend; it is part of the LLM
+    cache key and checkpoint hashes, so results from one model are never
+    reused for another.
+    """
+
+    name = 'base'
+
+    def generate(self, prompt: str) -> str:
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    def __init__(self, api_key: str, model: str):
+        import google.generativeai as genai
+        from google.api_core import exceptions
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model)
+        self.name = model
+        # Errors that no amount of retrying fixes, e.g. a retired model name
+        self._permanent = (exceptions.NotFound, exceptions.InvalidArgument, exceptions.PermissionDenied,
+                           exceptions.Unauthenticated)
+
+    def generate(self, prompt: str) -> str:
+        try:
+            response = self.model.generate_content(prompt)
+        except self._permanent as e:
+            raise LLMPermanentError(str(e)) from e
+        except Exception as e:
+            raise LLMError(str(e)) from e
+
+        try:
+            return response.text
+        except ValueError as e:
+            # Raised when the response was blocked and carries no text
+            raise LLMError(f"Empty response: {e}") from e
+
+
+class FakeLLMBackend(LLMBackend):
+    """Local stand-in for Gemini, for benchmarks and load tests
+
+    Responses are derived from a hash of the prompt, so the same profile
+    always gets the same evaluation regardless of thread scheduling.
+    latency_distribution is one of fixed, uniform, exponential or lognormal,
+    with latency_ms as the mean. error_rate and malformed_rate are the
+    fractions of calls that raise a retryable error or return unparseable
+    text.
+    """
+
+    name = 'fake'
+
+    def __init__(self, latency_ms: float = 0, latency_distribution: str = 'fixed', error_rate: float = 0,
+                 malformed_rate: float = 0, seed: int = 0):
+        if latency_distribution not in ('fixed', 'uniform', 'exponential', 'lognormal'):
+            raise ValueError(f"Unknown latency distribution: {latency_distribution}")
+        self.latency_ms = latency_ms
+        self.latency_distribution = latency_distribution
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.random = random.Random(seed)
+        self.seed = seed
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _latency(self) -> float:
+        mean = self.latency_ms / 1000.0
+        with self._lock:
+            if self.latency_distribution == 'uniform':
+                return self.random.uniform(0, 2 * mean)
+            if self.latency_distribution == 'exponential':
+                return self.random.expovariate(1 / mean) if mean else 0
+            if self.latency_distribution == 'lognormal':
+                # sigma 0.5 keeps the mean at latency_ms while giving a long tail
+                return self.random.lognormvariate(0, 0.5) * mean / 1.1331
+        return mean
+
+    def generate(self, prompt: str) -> str:
+        with self._lock:
+            self.calls += 1
+            roll = self.random.random()
+        time.sleep(self._latency())
+
+        if roll < self.error_rate:
+            raise LLMError("Injected failure: 503 service unavailable")
+        if roll < self.error_rate + self.malformed_rate:
+            return "I'm sorry, I can't evaluate this candidate right now."
+
+        digest = hashlib.sha256(f"{self.seed}:{prompt}".encode('utf-8')).digest()
+        score = 1 + digest[0] % 10
+        issues = 'None' if score >= 7 else 'Limited evidence of senior-level impact'
+        return (
+            f"Summary: Candidate with a profile hash of {digest[:4].hex()}; "
+            f"strengths and gaps summarised for review.\n"
+            f"Score: {score}\n"
+            f"Issues: {issues}\n"
+            f"Follow-Ups:\n"
+            f"• Walk through the most complex system you owned end to end.\n"
+            f"• Confirm availability and start date."
+        )
+
+
+def create_llm_backend(settings: Dict, api_key: str = None, model: str = None) -> LLMBackend:
+    """Build the backend selected by settings['backend']"""
+    backend = settings['backend']
+    if backend == 'gemini':
+        return GeminiBackend(api_key, model)
+    if backend == 'fake':
+        logging.info("Using the fake LLM backend")
+        return FakeLLMBackend(
+            latency_ms=settings['fake_latency_ms'],
+            latency_distribution=settings['fake_latency_distribution'],
+            error_rate=settings['fake_error_rate'],
+            malformed_rate=settings['fake_malformed_rate'],
+            seed=settings['fake_seed']
+        )
+    raise ValueError(f"Unknown LLM backend: {backend}")
@@ -0,0 +1,106 @@
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+
+import codec
+
+
+class LLMCache:
+    """SQLite-backed cache of parsed LLM evaluations
+
+    Entries are keyed by a hash of the canonicalized profile JSON, the prompt
+    template and the model name, so any change to one of those is a miss.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100000, max_age_days: float = 30,
+                 evict_every: int = 500):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400
+        self.evict_every = evict_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_evaluations (
+                cache_key TEXT PRIMARY KEY,
+                evaluation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_last_used ON llm_evaluations (last_used)")
+        self._conn.commit()
+        self.evict()
+
+    @staticmethod
+    def make_key(compressed_json: str, prompt_template: str, model_name: str) -> str:
+        """Hash a profile together with the prompt and model that evaluate it"""
+        try:
+            canonical = codec.canonical(compressed_json)
+        except ValueError:
+            canonical = compressed_json
+
+        digest = hashlib.sha256()
+        for part in (model_name, prompt_template, canonical):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached evaluation for a key, or None"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT evaluation, created_at FROM llm_evaluations WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            if now - row[1] > self.max_age:
+                self._conn.execute("DELETE FROM llm_evaluations WHERE cache_key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute("UPDATE llm_evaluations SET last_used = ? WHERE cache_key = ?", (now, key))
+            self._conn.commit()
+        return codec.loads(row[0])
+
+    def put(self, key: str, evaluation: Dict):
+        """Store a parsed evaluation"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_evaluations (cache_key, evaluation, created_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, codec.dumps(evaluation), now, now)
+            )
+            self._conn.commit()
+            self._writes += 1
+            due = self._writes % self.evict_every == 0
+
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Drop entries past the age limit, then the least recently used beyond max_entries"""
+        with self._lock:
+            expired = self._conn.execute(
+                "DELETE FROM llm_evaluations WHERE created_at < ?", (time.time() - self.max_age,)
+            ).rowcount
+            overflow = self._conn.execute(
+                "DELETE FROM llm_evaluations WHERE cache_key IN ("
+                "SELECT cache_key FROM llm_evaluations ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+            self._conn.commit()
+
+        if expired or overflow:
+            logging.info(f"Evicted {expired + overflow} LLM cache entries")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,12 +1,28 @@
 import os
+import sys
 import json
+import socket
+import hashlib
+import argparse
 import time
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Any
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
-import google.generativeai as genai
+from config import (SYSTEM_SETTINGS, GEMINI_CONFIG, LLM_BACKEND_SETTINGS, LLM_CACHE_SETTINGS, RUN_STATE_SETTINGS,
+                    METRICS_SETTINGS, REPLICA_SETTINGS)
+from llm_backends import LLMError, LLMPermanentError, create_llm_backend
+from llm_cache import LLMCache
+from metrics import Metrics
+from run_state import RunStateStore
+from pipeline import Stage, StagedPipeline, merge_streams
+from replica import AirtableReplica
+import codec
+from shortlist_engine import PRESENT, ProfileColumns, merged_months, phrase_matcher, tenures_of
 
 load_dotenv()
 
@@ -15,13 +31,105 @@ AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN')
 AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 
-# Airtable API configuration
-AIRTABLE_API_URL = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}"
+# Airtable API configuration (AIRTABLE_API_ROOT can point at fake_airtable.py for load tests)
+AIRTABLE_API_ROOT = os.getenv('AIRTABLE_API_ROOT', 'https://api.airtable.com/v0').rstrip('/')
+AIRTABLE_API_URL = f"{AIRTABLE_API_ROOT}/{AIRTABLE_BASE_ID}"
 HEADERS = {
     'Authorization': f'Bearer {AIRTABLE_TOKEN}',
     'Content-Type': 'application/json'
 }
 
+def create_airtable_session() -> requests.Session:
+    """Create a keep-alive session with a pooled adapter for Airtable calls"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=SYSTEM_SETTINGS['pool_connections'],
+        pool_maxsize=SYSTEM_SETTINGS['pool_maxsize']
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(HEADERS)
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    return session
+
+class RateLimiter:
+    """Thread-safe token bucket that slows down when Airtable answers 429"""
+    
+    def __init__(self, rate: float, burst: int = None):
+        self.configured_rate = rate
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now >= self.blocked_until:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait_time = (1 - self.tokens) / self.rate
+                else:
+                    wait_time = self.blocked_until - now
+            time.sleep(wait_time)
+    
+    def throttled(self, retry_after: float):
+        """Pause every caller for retry_after seconds and halve the rate"""
+        with self.lock:
+            self.rate = max(self.max_rate / 10, self.rate / 2)
+            self.tokens = 0.0
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+            self.updated = self.blocked_until
+    
+    def share(self, workers: int):
+        """Scale to this worker's share of the configured rate split across workers (1 restores it)"""
+        with self.lock:
+            max_rate = self.configured_rate / workers
+            self.rate *= max_rate / self.max_rate
+            self.max_rate = max_rate
+            self.capacity = self.burst or max(1, int(max_rate))
+            self.tokens = min(self.tokens, self.capacity)
+    
+    def succeeded(self):
+        """Creep back toward the configured rate after a successful call"""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(base_id: str) -> RateLimiter:
+    """Get the limiter shared by all Airtable traffic to a base"""
+    with _rate_limiters_lock:
+        if base_id not in _rate_limiters:
+            _rate_limiters[base_id] = RateLimiter(SYSTEM_SETTINGS['airtable_requests_per_second'])
+        return _rate_limiters[base_id]
+
+def retry_after_seconds(response: requests.Response, attempt: int) -> float:
+    """Read Retry-After from a 429, falling back to exponential backoff"""
+    try:
+        return float(response.headers.get('Retry-After', ''))
+    except ValueError:
+        return SYSTEM_SETTINGS['rate_limit_delay'] * SYSTEM_SETTINGS['retry_backoff_factor'] ** attempt
+
+def permanent_failure(response: Optional[requests.Response]) -> bool:
+    """Whether Airtable refused a request in a way resending can't fix (a 4xx other than 429)"""
+    return response is not None and 400 <= response.status_code < 500 and response.status_code != 429
+
+def iterator_expired(response: Optional[requests.Response]) -> bool:
+    """Whether a listing request failed because its offset is no longer valid"""
+    return response is not None and response.status_code == 422 and \
+        'LIST_RECORDS_ITERATOR_NOT_AVAILABLE' in response.text
+
 # Table names
 TABLES = {
     'applicants': 'Applicants',
@@ -40,6 +148,59 @@ TIER1_COMPANIES = [
 # Qualified locations
 QUALIFIED_LOCATIONS = ['us', 'usa', 'united states', 'canada', 'uk', 'united kingdom', 'germany', 'india']
 
+# Shortlist thresholds
+MIN_EXPERIENCE_YEARS = 4
+MAX_HOURLY_RATE = 100
+MIN_AVAILABILITY_HOURS = 20
+
+SHORTLIST_RULES = {
+    'tier1_companies': TIER1_COMPANIES,
+    'qualified_locations': QUALIFIED_LOCATIONS,
+    'min_experience_years': MIN_EXPERIENCE_YEARS,
+    'max_hourly_rate': MAX_HOURLY_RATE,
+    'min_availability_hours': MIN_AVAILABILITY_HOURS
+}
+
+# Whole-word matchers shared with the bulk engine
+TIER1_MATCHER = phrase_matcher(TIER1_COMPANIES)
+LOCATION_MATCHER = phrase_matcher(QUALIFIED_LOCATIONS)
+
+# Identifies the rule set in checkpoint hashes, so changing a rule re-runs shortlisting
+SHORTLIST_RULES_KEY = json.dumps([TIER1_COMPANIES, QUALIFIED_LOCATIONS, MIN_EXPERIENCE_YEARS,
+                                  MAX_HOURLY_RATE, MIN_AVAILABILITY_HOURS, 'whole-word', 'merged-tenure'])
+
+LLM_EVALUATION_PROMPT = """
+You are a recruiting analyst. Given this JSON applicant profile, do four things:
+
+1. Provide a concise 75-word summary.
+2. Rate overall candidate quality from 1-10 (higher is better).
+3. List any data gaps or inconsistencies you notice.
+4. Suggest up to three follow-up questions to clarify gaps.
+
+Applicant Profile JSON:
+{compressed_json}
+
+Return exactly in this format:
+Summary: <text>
+Score: <integer>
+Issues: <comma-separated list or 'None'>
+Follow-Ups: <bullet list>
+"""
+
+LLM_FAILED_SUMMARY = 'LLM evaluation failed'
+
+def stage_hash(*parts: str) -> str:
+    """Hash the inputs of a pipeline stage for the checkpoint journal"""
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+def llm_result_fields(evaluation: Dict) -> Dict:
+    """Map an LLM evaluation onto Applicants columns"""
+    return {
+        'LLM Summary': evaluation['summary'],
+        'LLM Score': evaluation['score'],
+        'LLM Follow-Ups': evaluation['follow_ups']
+    }
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -50,14 +211,248 @@ logging.basicConfig(
     ]
 )
 
+# Child tables that link back to Applicants; cached copies of these are
+# dropped on write because their linked fields come back in a different shape
+LINKED_TABLES = (TABLES['personal'], TABLES['experience'], TABLES['salary'])
+
+# Columns read by targeted single-applicant fetches
+READ_FIELDS = {
+    TABLES['applicants']: ['Applicant ID', 'Compressed JSON'],
+    TABLES['personal']: ['Applicant ID', 'Full Name', 'Email', 'Location', 'LinkedIn'],
+    TABLES['experience']: ['Applicant ID', 'Company', 'Title', 'Start Date', 'End Date', 'Technologies'],
+    TABLES['salary']: ['Applicant ID', 'Preferred Rate', 'Minimum Rate', 'Currency', 'Availability']
+}
+
+# Columns downloaded by the bulk reads; Airtable sends every field unless
+# fields[] narrows it, including the large Compressed JSON, LLM Summary and
+# LLM Follow-Ups text, so each read declares only what it uses. Replica reads
+# are local and return every field regardless.
+ID_FIELDS = ['Applicant ID']
+BATCH_FIELDS = {
+    # The pipeline rebuilds the profile from the child tables; the status tells
+    # whether a re-check of an unchanged profile changed anything
+    TABLES['applicants']: ['Applicant ID', 'Shortlist Status'],
+    **{table_name: READ_FIELDS[table_name] for table_name in LINKED_TABLES}
+}
+RESCORE_FIELDS = ['Applicant ID', 'Compressed JSON', 'Shortlist Status']
+STATS_FIELDS = {
+    TABLES['applicants']: ['Shortlist Status', 'LLM Score'],
+    TABLES['personal']: ID_FIELDS,
+    TABLES['experience']: ID_FIELDS,
+    TABLES['salary']: ID_FIELDS,
+    TABLES['shortlisted']: ['Applicant']
+}
+# Large text columns stats only counts; a filterByFormula listing of IDs counts them without the text
+STATS_PRESENCE_FIELDS = ['Compressed JSON', 'LLM Summary']
+
+# Columns whose edits make an applicant need reprocessing; pipeline outputs
+# on Applicants are left out so our own writes don't retrigger a run
+INPUT_FIELDS = {
+    TABLES['applicants']: ['Applicant ID'],
+    TABLES['personal']: READ_FIELDS[TABLES['personal']],
+    TABLES['experience']: READ_FIELDS[TABLES['experience']],
+    TABLES['salary']: READ_FIELDS[TABLES['salary']]
+}
+
+# Applicant IDs per OR() formula when loading a subset of applicants
+FORMULA_CHUNK_SIZE = 50
+
+def applicant_formula(table_name: str, applicant_id: str) -> str:
+    """Build a filterByFormula expression matching one applicant's records"""
+    escaped = applicant_id.replace('\\', '\\\\').replace("'", "\\'")
+    if table_name in LINKED_TABLES:
+        return f"FIND(',{escaped},', ',' & ARRAYJOIN({{Applicant ID}}, ',') & ',')"
+    return f"{{Applicant ID}} = '{escaped}'"
+
+def applicants_formula(table_name: str, applicant_ids: List[str]) -> str:
+    """Build a filterByFormula expression matching several applicants' records"""
+    return f"OR({', '.join(applicant_formula(table_name, a) for a in applicant_ids)})"
+
+def shard_of(applicant_id: str, shard_count: int) -> int:
+    """Stable shard number for an applicant, the same on every host and run"""
+    return int(hashlib.md5(applicant_id.encode('utf-8')).hexdigest(), 16) % shard_count
+
+def modified_since_formula(table_name: str, since: str) -> str:
+    """Build a filterByFormula expression for rows whose input columns changed after since"""
+    fields = ', '.join(f"{{{field}}}" for field in INPUT_FIELDS[table_name])
+    return f"IS_AFTER(LAST_MODIFIED_TIME({fields}), DATETIME_PARSE('{since}'))"
+
+def applicant_ids_of(record: Dict) -> List[str]:
+    """Applicant IDs a record belongs to (plain field on Applicants, linked list elsewhere)"""
+    value = record.get('fields', {}).get('Applicant ID')
+    if not value:
+        return []
+    return value if isinstance(value, list) else [value]
+
+class TableSnapshot:
+    """Records of one table with hash indexes built once per load"""
+    
+    def __init__(self, records: List[Dict]):
+        self.records = records
+        self._by_id: Optional[Dict[str, Dict]] = None
+        self._by_applicant: Optional[Dict[str, List[Dict]]] = None
+    
+    def by_id(self) -> Dict[str, Dict]:
+        """Map Airtable record ID to record"""
+        if self._by_id is None:
+            self._by_id = {r['id']: r for r in self.records}
+        return self._by_id
+    
+    def by_applicant(self) -> Dict[str, List[Dict]]:
+        """Map Applicant ID to every record linked to that applicant"""
+        if self._by_applicant is None:
+            index = {}
+            for record in self.records:
+                for applicant_id in applicant_ids_of(record):
+                    index.setdefault(applicant_id, []).append(record)
+            self._by_applicant = index
+        return self._by_applicant
+    
+    def upsert(self, record: Dict):
+        """Apply a record returned by a write, keeping the indexes in step"""
+        existing = self.by_id().get(record['id'])
+        if existing is None:
+            self.records.append(record)
+            self._by_id[record['id']] = record
+            if self._by_applicant is not None:
+                for applicant_id in applicant_ids_of(record):
+                    self._by_applicant.setdefault(applicant_id, []).append(record)
+            return
+        
+        if applicant_ids_of(existing) != applicant_ids_of(record):
+            self._by_applicant = None
+        existing['fields'] = record.get('fields', {})
+
+# Airtable accepts at most 10 records per create/update/delete request
+AIRTABLE_BATCH_SIZE = 10
+
+class WritesRejectedError(Exception):
+    """Airtable refused some buffered writes for good; the rest were sent"""
+
+class AirtableWriteBuffer:
+    """Pending record writes, merged per record and sent in 10-record batches"""
+    
+    def __init__(self, system: 'MercorAirtableSystem', batch_size: int = AIRTABLE_BATCH_SIZE):
+        self.system = system
+        self.batch_size = batch_size
+        # (method, table) -> entry ID -> {'record': payload, 'keys': set}, in the order queued;
+        # keys name what a write belongs to, e.g. an applicant ID
+        self.queues: Dict[tuple, Dict[Any, Dict]] = {}
+        self._created = 0
+        # Writes Airtable refused for good are dropped; failed collects their keys
+        self.rejected = 0
+        self.failed: Set[str] = set()
+    
+    def delete(self, table_name: str, record_id: str):
+        pending = self._queue('DELETE', table_name, record_id, record_id)
+        if len(pending) >= self.batch_size:
+            self._flush('DELETE', table_name)
+    
+    def update(self, table_name: str, record_id: str, fields: Dict, key: str = None):
+        pending = self._queue('PATCH', table_name, record_id, {'id': record_id, 'fields': {}}, key)
+        pending[record_id]['record']['fields'].update(fields)
+        # Only send once a newer record is queued, so the oldest batch has
+        # had the chance to collect every field update its records will get
+        if len(pending) > self.batch_size:
+            self._flush('PATCH', table_name, self.batch_size)
+    
+    def create(self, table_name: str, fields: Dict, key: str = None):
+        self._created += 1
+        pending = self._queue('POST', table_name, self._created, {'fields': fields}, key)
+        if len(pending) >= self.batch_size:
+            self._flush('POST', table_name)
+    
+    def pending(self) -> int:
+        """Number of queued writes not yet sent"""
+        return sum(map(len, self.queues.values()))
+    
+    def flush(self):
+        """Send everything still pending, deletes first"""
+        for method in ('DELETE', 'PATCH', 'POST'):
+            for queue_method, table_name in list(self.queues):
+                if queue_method == method:
+                    self._flush(method, table_name)
+    
+    def _queue(self, method: str, table_name: str, entry_id: Any, record: Any, key: str = None) -> Dict:
+        pending = self.queues.setdefault((method, table_name), {})
+        entry = pending.setdefault(entry_id, {'record': record, 'keys': set()})
+        if key is not None:
+            entry['keys'].add(key)
+        return pending
+    
+    def _flush(self, method: str, table_name: str, limit: int = None):
+        pending = self.queues.get((method, table_name), {})
+        entry_ids = list(pending)[:limit]
+        for i in range(0, len(entry_ids), self.batch_size):
+            self._send_entries(method, table_name, pending, entry_ids[i:i + self.batch_size])
+        if not pending:
+            self.queues.pop((method, table_name), None)
+    
+    def _send_entries(self, method: str, table_name: str, pending: Dict, entry_ids: List):
+        # Entries leave the queue only once sent or rejected, so a retryable
+        # failure keeps them for the next flush instead of silently dropping them
+        try:
+            self._send(method, table_name, [pending[entry_id]['record'] for entry_id in entry_ids])
+        except requests.exceptions.HTTPError as e:
+            if not permanent_failure(e.response):
+                raise
+            if len(entry_ids) > 1:
+                # One bad record fails its whole batch; send them singly to find it
+                for entry_id in entry_ids:
+                    self._send_entries(method, table_name, pending, [entry_id])
+                return
+            record = 'a new record' if method == 'POST' else entry_ids[0]
+            logging.error(f"Airtable rejected {method} of {record} in {table_name}, dropping it: {e}")
+            self.rejected += 1
+            self.failed.update(pending[entry_ids[0]]['keys'])
+        for entry_id in entry_ids:
+            del pending[entry_id]
+    
+    def _send(self, method: str, table_name: str, records: List):
+        if self.system.dry_run:
+            logging.info(f"Dry run: skipped {method} of {len(records)} records in {table_name}")
+            return
+        if method == 'DELETE':
+            self.system.airtable_request(method, table_name, params={'records[]': records})
+        else:
+            self.system.airtable_request(method, table_name, {'records': records})
+
 class MercorAirtableSystem:
-    def __init__(self):
+    def __init__(self, dry_run: bool = False):
+        self.dry_run = dry_run
+        self._snapshots: Optional[Dict[str, TableSnapshot]] = None
+        self._write_buffer: Optional[AirtableWriteBuffer] = None
+        self.session = create_airtable_session()
+        self.metrics = Metrics()
+        if METRICS_SETTINGS['http_port']:
+            self.metrics.serve(METRICS_SETTINGS['http_port'], METRICS_SETTINGS['http_host'])
+        self.rate_limiter = get_rate_limiter(AIRTABLE_BASE_ID)
+        self.llm_rate_limiter = RateLimiter(SYSTEM_SETTINGS['llm_requests_per_minute'] / 60.0,
+                                            burst=SYSTEM_SETTINGS['llm_concurrency'])
+        self.llm_cache = LLMCache(
+            LLM_CACHE_SETTINGS['path'],
+            max_entries=LLM_CACHE_SETTINGS['max_entries'],
+            max_age_days=LLM_CACHE_SETTINGS['max_age_days']
+        ) if LLM_CACHE_SETTINGS['enabled'] else None
+        self.run_state = RunStateStore(RUN_STATE_SETTINGS['path'])
+        self.replica = AirtableReplica(REPLICA_SETTINGS['path'], applicant_ids_of) \
+            if REPLICA_SETTINGS['enabled'] else None
+        self._replica_lock = threading.Lock()
+        self.lease_owner: Optional[str] = None
+        self.lease_since = 0.0
+        self._checkpoints: Dict[str, Dict[str, str]] = {}
+        # Jobs whose writes are queued; journaled and released once the writes are flushed
+        self._queued_jobs: List[Dict] = []
+        # Fixed for the length of a batch so ongoing roles all end in the same month
+        self.reference_now: Optional[datetime] = None
         self.validate_config()
-        self.setup_gemini()
+        self.setup_llm_backend()
     
     def validate_config(self):
         """Validate that all required environment variables are set"""
-        required_vars = ['AIRTABLE_TOKEN', 'AIRTABLE_BASE_ID', 'GEMINI_API_KEY']
+        required_vars = ['AIRTABLE_TOKEN', 'AIRTABLE_BASE_ID']
+        if LLM_BACKEND_SETTINGS['backend'] == 'gemini':
+            required_vars.append('GEMINI_API_KEY')
         missing = [var for var in required_vars if not os.getenv(var)]
         
         if missing:
@@ -65,77 +460,397 @@ class MercorAirtableSystem:
         
         logging.info("Configuration validated successfully")
     
-    def setup_gemini(self):
-        """Initialize Gemini AI client"""
+    def setup_llm_backend(self):
+        """Initialize the configured LLM backend"""
         try:
-            genai.configure(api_key=GEMINI_API_KEY)
-            self.gemini_model = genai.GenerativeModel('gemini-pro')
-            logging.info("Gemini AI configured successfully")
+            self.llm_backend = create_llm_backend(LLM_BACKEND_SETTINGS, GEMINI_API_KEY, GEMINI_CONFIG['model'])
+            logging.info(f"LLM backend configured successfully ({self.llm_backend.name})")
         except Exception as e:
-            logging.error(f"Failed to setup Gemini AI: {e}")
+            logging.error(f"Failed to setup LLM backend: {e}")
             raise
     
-    def airtable_request(self, method: str, endpoint: str, data: Dict = None, max_retries: int = 3) -> Dict:
+    def airtable_request(self, method: str, endpoint: str, data: Dict = None, max_retries: int = 3,
+                         params: Dict = None) -> Dict:
         """Make request to Airtable API with retry logic"""
         url = f"{AIRTABLE_API_URL}/{endpoint}"
+        table_name = endpoint.split('/')[0]
+        attempt = 0
+        throttled = 0
         
-        for attempt in range(max_retries):
+        while True:
             try:
-                if method == 'GET':
-                    response = requests.get(url, headers=HEADERS)
-                elif method == 'POST':
-                    response = requests.post(url, headers=HEADERS, json=data)
-                elif method == 'PATCH':
-                    response = requests.patch(url, headers=HEADERS, json=data)
-                elif method == 'PUT':
-                    response = requests.put(url, headers=HEADERS, json=data)
+                self.rate_limiter.acquire()
+                started = time.perf_counter()
+                try:
+                    response = self.session.request(
+                        method, url, json=data, params=params,
+                        timeout=(SYSTEM_SETTINGS['connect_timeout'], SYSTEM_SETTINGS['read_timeout'])
+                    )
+                except requests.exceptions.RequestException:
+                    self.metrics.inc('airtable_requests_total', method=method, table=table_name, status='error')
+                    raise
+                finally:
+                    self.metrics.observe('airtable_request_seconds', time.perf_counter() - started,
+                                         method=method, table=table_name)
+                
+                self.metrics.inc('airtable_requests_total', method=method, table=table_name,
+                                 status=response.status_code)
+                self.metrics.inc('airtable_request_bytes_total', len(response.request.body or b''), table=table_name)
+                # Content-Length is the size on the wire, before gzip decoding
+                self.metrics.inc('airtable_response_bytes_total',
+                                 int(response.headers.get('Content-Length') or len(response.content)), table=table_name)
+                
+                if response.status_code == 429 and throttled < SYSTEM_SETTINGS['max_throttle_retries']:
+                    wait_time = retry_after_seconds(response, throttled)
+                    self.rate_limiter.throttled(wait_time)
+                    throttled += 1
+                    self.metrics.inc('airtable_throttled_total', table=table_name)
+                    self.metrics.inc('airtable_retries_total', table=table_name, reason='throttled')
+                    logging.warning(f"Rate limited by Airtable, backing off {wait_time:.1f}s")
+                    continue
                 
                 response.raise_for_status()
-                return response.json()
+                self.rate_limiter.succeeded()
+                result = codec.loads(response.content)
+                if method != 'GET':
+                    self._sync_snapshot(method, endpoint, result)
+                    self._sync_replica(method, endpoint, result)
+                return result
                 
             except requests.exceptions.RequestException as e:
-                if attempt == max_retries - 1:
+                if permanent_failure(e.response):
+                    raise  # e.g. an expired offset or an invalid record; resending fails the same way
+                attempt += 1
+                if attempt == max_retries:
                     logging.error(f"API request failed after {max_retries} attempts: {e}")
                     raise
                 
-                wait_time = 2 ** attempt
+                wait_time = 2 ** (attempt - 1)
+                self.metrics.inc('airtable_retries_total', table=table_name, reason='error')
                 logging.warning(f"Request failed, retrying in {wait_time}s: {e}")
                 time.sleep(wait_time)
     
-    def get_all_records(self, table_name: str) -> List[Dict]:
-        """Get all records from a table with pagination"""
-        all_records = []
-        offset = None
+    def iter_pages(self, table_name: str, formula: str = None, fields: List[str] = None) -> Iterator[List[Dict]]:
+        """Yield a table's records page by page as Airtable returns them, optionally filtered server-side"""
+        params = {}
+        if formula:
+            params['filterByFormula'] = formula
+        if fields:
+            params['fields[]'] = fields
         
+        # Time spent waiting on Airtable, not on whoever consumes the pages
+        fetching = 0.0
+        count = 0
+        # Record IDs already yielded, in case the listing has to start over
+        seen = set()
         while True:
-            endpoint = table_name
-            if offset:
-                endpoint += f"?offset={offset}"
-            
-            response = self.airtable_request('GET', endpoint)
-            all_records.extend(response.get('records', []))
+            started = time.perf_counter()
+            try:
+                response = self.airtable_request('GET', table_name, params=params)
+            except requests.exceptions.HTTPError as e:
+                # Airtable drops listing iterators left idle too long, which a slow
+                # consumer of a stream can cause; restart and skip what was yielded
+                if not params.get('offset') or not iterator_expired(e.response):
+                    raise
+                logging.warning(f"Listing of {table_name} expired after {count} records, restarting it")
+                params.pop('offset')
+                continue
+            finally:
+                fetching += time.perf_counter() - started
+            page = [record for record in response.get('records', []) if record['id'] not in seen]
+            seen.update(record['id'] for record in page)
+            count += len(page)
+            self.metrics.inc('airtable_pages_total', table=table_name)
+            self.metrics.inc('airtable_records_fetched_total', len(page), table=table_name)
             
             offset = response.get('offset')
+            params['offset'] = offset
+            yield page
             if not offset:
                 break
         
-        logging.info(f"Retrieved {len(all_records)} records from {table_name}")
+        self.metrics.observe('airtable_fetch_seconds', fetching, table=table_name)
+        logging.info(f"Retrieved {count} records from {table_name}")
+    
+    def get_all_records(self, table_name: str, formula: str = None, fields: List[str] = None) -> List[Dict]:
+        """Get all records from a table with pagination, optionally filtered server-side"""
+        all_records = []
+        for page in self.iter_pages(table_name, formula=formula, fields=fields):
+            all_records.extend(page)
         return all_records
     
+    def stream_listings(self, listings: Dict[Any, tuple]) -> Iterator[tuple]:
+        """Page through several listings concurrently, yielding (key, page) as pages arrive"""
+        # Each listing is paged in order, since the next offset comes with the previous
+        # page, but independent listings run in parallel and pages are prefetched
+        return merge_streams(
+            {key: self.iter_pages(table_name, **options) for key, (table_name, options) in listings.items()},
+            workers=SYSTEM_SETTINGS['listing_concurrency'],
+            queue_size=SYSTEM_SETTINGS['listing_prefetch_pages']
+        )
+    
+    def iter_records(self, table_name: str, fields: List[str] = None, formula: str = None) -> Iterator[Dict]:
+        """Yield a table's records one at a time, from the replica unless a formula needs Airtable"""
+        if self.replica and not formula:
+            for page in self.fresh_replica(table_name).iter_pages(table_name):
+                yield from page
+            return
+        
+        listing = {table_name: (table_name, {'formula': formula, 'fields': fields})}
+        for _, page in self.stream_listings(listing):
+            yield from page
+    
+    def stream_tables(self, table_names: Iterable[str], fields: Dict[str, List[str]] = None) -> Iterator[tuple]:
+        """Yield (table_name, page) for every page of several tables, downloaded concurrently"""
+        table_names = list(table_names)
+        fields = fields or {}
+        if self.replica:
+            self.refresh_replica(table_names)
+            for table_name in table_names:
+                for page in self.replica.iter_pages(table_name):
+                    yield table_name, page
+            return
+        
+        yield from self.stream_listings({table_name: (table_name, {'fields': fields.get(table_name)})
+                                         for table_name in table_names})
+    
+    def load_tables(self, table_names: Iterable[str], fields: Dict[str, List[str]] = None) -> Dict[str, List[Dict]]:
+        """Get every record of several tables, downloading them concurrently"""
+        tables = {table_name: [] for table_name in table_names}
+        for table_name, page in self.stream_tables(tables, fields):
+            tables[table_name].extend(page)
+        return tables
+    
+    def load_table(self, table_name: str, fields: List[str] = None) -> List[Dict]:
+        """Get all records of a table from the replica if enabled, otherwise from Airtable"""
+        if self.replica:
+            return self.fresh_replica(table_name).records(table_name)
+        return self.get_all_records(table_name, fields=fields)
+    
+    def fresh_replica(self, table_name: str) -> AirtableReplica:
+        """The replica, after an incremental sync of the table if it is due one"""
+        self.refresh_replica([table_name])
+        return self.replica
+    
+    def refresh_replica(self, table_names: List[str]):
+        """Sync whichever of these tables are due an incremental sync"""
+        with self._replica_lock:
+            due = [t for t in table_names if self.replica.needs_sync(t, REPLICA_SETTINGS['max_staleness_seconds'])]
+            if due:
+                self.sync_replica(table_names=due)
+    
+    def sync_replica(self, full: bool = False, table_names: List[str] = None) -> Dict[str, int]:
+        """Bring the local replica up to date with Airtable; returns records fetched per table"""
+        overlap = timedelta(seconds=REPLICA_SETTINGS['sync_overlap_seconds'])
+        started = datetime.now(timezone.utc)
+        listings = {}
+        full_tables = set()
+        for table_name in table_names or TABLES.values():
+            state = self.replica.sync_state(table_name)
+            # A full download is also how rows deleted outside this system disappear
+            if full or state is None or \
+                    time.time() - state['full_synced_at'] > REPLICA_SETTINGS['full_sync_hours'] * 3600:
+                full_tables.add(table_name)
+                listings[table_name] = (table_name, {})
+            else:
+                since = (datetime.fromisoformat(state['synced_at']) - overlap).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+                listings[table_name] = (table_name, {
+                    'formula': f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{since}'))"
+                })
+        
+        # Pages are applied as they arrive, so a sync never holds a whole table
+        fetched = {table_name: 0 for table_name in listings}
+        listed = {table_name: set() for table_name in full_tables}
+        for table_name, page in self.stream_listings(listings):
+            self.replica.upsert(table_name, page)
+            fetched[table_name] += len(page)
+            if table_name in listed:
+                listed[table_name].update(record['id'] for record in page)
+        
+        for table_name, count in fetched.items():
+            self.replica.finish_sync(table_name, started, listed.get(table_name))
+            if table_name in full_tables:
+                logging.info(f"Replica: full sync of {table_name}, {count} records")
+            else:
+                logging.info(f"Replica: {count} changed records synced from {table_name}")
+        return fetched
+    
+    def _sync_replica(self, method: str, endpoint: str, response: Dict):
+        """Apply a write that Airtable accepted to the replica"""
+        if self.replica is None:
+            return
+        
+        table_name = endpoint.split('?')[0].split('/')[0]
+        records = response.get('records', [response])
+        if method == 'DELETE':
+            self.replica.delete(table_name, [r['id'] for r in records if r.get('deleted')])
+        elif table_name in LINKED_TABLES or not all('id' in r for r in records):
+            # Linked fields come back as record IDs, so fetch the rows as listings return them
+            self.replica.mark_stale(table_name)
+        else:
+            self.replica.upsert(table_name, records)
+    
+    @contextmanager
+    def snapshot_run(self):
+        """Serve table reads from an in-memory snapshot for the duration of a run"""
+        if self._snapshots is not None:
+            yield
+            return
+        
+        self._snapshots = {}
+        try:
+            yield
+        finally:
+            self._snapshots = None
+    
+    def get_table_snapshot(self, table_name: str) -> TableSnapshot:
+        """Get a table with its indexes, loading it at most once per snapshot run"""
+        if self._snapshots is None:
+            return TableSnapshot(self.load_table(table_name))
+        
+        if table_name not in self._snapshots:
+            self._snapshots[table_name] = TableSnapshot(self.load_table(table_name))
+        return self._snapshots[table_name]
+    
+    def get_table_records(self, table_name: str) -> List[Dict]:
+        """Get all records from a table, loading it at most once per snapshot run"""
+        return self.get_table_snapshot(table_name).records
+    
+    def find_applicant_records(self, table_name: str, applicant_id: str) -> List[Dict]:
+        """Get one applicant's records from the run snapshot, the replica or a filtered listing"""
+        # With the replica, snapshot runs only serve tables they have already loaded
+        if self._snapshots is not None and (self.replica is None or table_name in self._snapshots):
+            snapshot = self.get_table_snapshot(table_name)
+        elif self.replica:
+            return self.fresh_replica(table_name).applicant_records(table_name, [applicant_id])
+        else:
+            snapshot = TableSnapshot(self.get_all_records(
+                table_name,
+                formula=applicant_formula(table_name, applicant_id),
+                fields=READ_FIELDS.get(table_name)
+            ))
+        return snapshot.by_applicant().get(applicant_id, [])
+    
+    def find_changed_applicants(self, scope: str = '') -> Optional[set]:
+        """Applicant IDs with input rows modified since the last successful run (None if unknown)"""
+        marks = self.run_state.get_high_water_marks(scope)
+        # A table never covered by a run means everything must be processed; deleted
+        # child rows are not detected, so an occasional full run is still needed
+        if any(table_name not in marks for table_name in INPUT_FIELDS):
+            return None
+        
+        overlap = timedelta(seconds=RUN_STATE_SETTINGS['incremental_overlap_seconds'])
+        listings = {}
+        for table_name in INPUT_FIELDS:
+            since = (datetime.fromisoformat(marks[table_name]) - overlap).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+            listings[table_name] = (table_name, {'formula': modified_since_formula(table_name, since),
+                                                 'fields': ID_FIELDS})
+        
+        changed = set()
+        for _, page in self.stream_listings(listings):
+            for record in page:
+                changed.update(applicant_ids_of(record))
+        return changed
+    
+    def preload_applicants(self, applicant_ids: set, fields: Dict[str, List[str]] = READ_FIELDS):
+        """Fill the run snapshot with just these applicants' rows (and columns) from every input table"""
+        applicant_ids = sorted(applicant_ids)
+        if self.replica:
+            self.refresh_replica(list(INPUT_FIELDS))
+            for table_name in INPUT_FIELDS:
+                self._snapshots[table_name] = TableSnapshot(self.replica.applicant_records(table_name, applicant_ids))
+            return
+        
+        listings = {}
+        for table_name in INPUT_FIELDS:
+            for i in range(0, len(applicant_ids), FORMULA_CHUNK_SIZE):
+                chunk = applicant_ids[i:i + FORMULA_CHUNK_SIZE]
+                listings[table_name, i] = (table_name, {'formula': applicants_formula(table_name, chunk),
+                                                        'fields': fields[table_name]})
+        
+        records = {table_name: [] for table_name in INPUT_FIELDS}
+        for (table_name, _), page in self.stream_listings(listings):
+            records[table_name].extend(page)
+        for table_name, table_records in records.items():
+            self._snapshots[table_name] = TableSnapshot(table_records)
+    
+    def find_applicant(self, applicant_id: str) -> Optional[Dict]:
+        """Look up an applicant's record in the Applicants table"""
+        return next(iter(self.find_applicant_records(TABLES['applicants'], applicant_id)), None)
+    
+    def invalidate_snapshot(self, *table_names: str):
+        """Drop cached tables so the next read reloads them"""
+        if self._snapshots is None:
+            return
+        
+        for table_name in table_names or list(self._snapshots):
+            self._snapshots.pop(table_name, None)
+    
+    def _sync_snapshot(self, method: str, endpoint: str, response: Dict):
+        """Keep the run snapshot consistent with a write that just succeeded"""
+        if self._snapshots is None:
+            return
+        
+        table_name = endpoint.split('?')[0].split('/')[0]
+        snapshot = self._snapshots.get(table_name)
+        if snapshot is None:
+            return
+        
+        records = response.get('records', [response])
+        if table_name in LINKED_TABLES or method not in ('POST', 'PATCH', 'PUT') or \
+                not all('id' in r for r in records):
+            self.invalidate_snapshot(table_name)
+            return
+        
+        for record in records:
+            snapshot.upsert(record)
+    
+    @contextmanager
+    def buffered_writes(self):
+        """Collect record writes and flush them in batches when the block exits"""
+        if self._write_buffer is not None:
+            yield self._write_buffer
+            return
+        
+        self._write_buffer = AirtableWriteBuffer(self)
+        try:
+            yield self._write_buffer
+            self._write_buffer.flush()
+            if self._write_buffer.rejected:
+                raise WritesRejectedError(f"Airtable rejected {self._write_buffer.rejected} record writes")
+        finally:
+            unsent = self._write_buffer.pending()
+            if unsent:
+                logging.error(f"{unsent} record writes were not sent to Airtable")
+            self._write_buffer = None
+    
+    def update_record(self, table_name: str, record_id: str, fields: Dict, key: str = None):
+        """Queue a field update for a record (sent immediately outside buffered_writes)"""
+        snapshot = self._snapshots.get(table_name) if self._snapshots is not None else None
+        if snapshot is not None and table_name not in LINKED_TABLES:
+            record = snapshot.by_id().get(record_id)
+            if record is not None:
+                record['fields'].update(fields)
+        
+        with self.buffered_writes() as buffer:
+            buffer.update(table_name, record_id, fields, key)
+    
+    def create_record(self, table_name: str, fields: Dict, key: str = None):
+        """Queue a new record (sent immediately outside buffered_writes)"""
+        with self.buffered_writes() as buffer:
+            buffer.create(table_name, fields, key)
+    
+    def delete_record(self, table_name: str, record_id: str):
+        """Queue a record deletion (sent immediately outside buffered_writes)"""
+        with self.buffered_writes() as buffer:
+            buffer.delete(table_name, record_id)
+    
     def get_applicant_data(self, applicant_id: str) -> Dict:
         """Get all data for a specific applicant"""
         try:
-            personal_records = self.get_all_records(TABLES['personal'])
-            personal = next((r for r in personal_records 
-                           if applicant_id in r.get('fields', {}).get('Applicant ID', [])), None)
-            
-            experience_records = self.get_all_records(TABLES['experience'])
-            experience = [r for r in experience_records 
-                         if applicant_id in r.get('fields', {}).get('Applicant ID', [])]
-            
-            salary_records = self.get_all_records(TABLES['salary'])
-            salary = next((r for r in salary_records 
-                          if applicant_id in r.get('fields', {}).get('Applicant ID', [])), None)
+            personal = next(iter(self.find_applicant_records(TABLES['personal'], applicant_id)), None)
+            experience = self.find_applicant_records(TABLES['experience'], applicant_id)
+            salary = next(iter(self.find_applicant_records(TABLES['salary'], applicant_id)), None)
             
             return {
                 'personal': personal,
@@ -192,69 +907,54 @@ class MercorAirtableSystem:
     def decompress_from_json(self, applicant_id: str, compressed_json: str) -> bool:
         """Decompress JSON back to normalized tables"""
         try:
-            data = json.loads(compressed_json)
+            data = codec.decode_profile(compressed_json)
             
-            if 'personal' in data:
-                personal_data = {
-                    'fields': {
+            with self.buffered_writes():
+                if 'personal' in data:
+                    personal_fields = {
                         'Applicant ID': [applicant_id],
                         'Full Name': data['personal'].get('name', ''),
                         'Email': data['personal'].get('email', ''),
                         'Location': data['personal'].get('location', ''),
                         'LinkedIn': data['personal'].get('linkedin', '')
                     }
-                }
-                
-                existing = self.get_all_records(TABLES['personal'])
-                existing_record = next((r for r in existing 
-                                      if applicant_id in r.get('fields', {}).get('Applicant ID', [])), None)
-                
-                if existing_record:
-                    self.airtable_request('PATCH', f"{TABLES['personal']}/{existing_record['id']}", 
-                                        {'fields': personal_data['fields']})
-                else:
-                    self.airtable_request('POST', TABLES['personal'], personal_data)
-            
-            if 'experience' in data:
-                existing_exp = self.get_all_records(TABLES['experience'])
-                for exp in existing_exp:
-                    if applicant_id in exp.get('fields', {}).get('Applicant ID', []):
-                        requests.delete(f"{AIRTABLE_API_URL}/{TABLES['experience']}/{exp['id']}", 
-                                      headers=HEADERS)
+                    
+                    existing_record = next(iter(self.find_applicant_records(TABLES['personal'], applicant_id)), None)
+                    
+                    if existing_record:
+                        self.update_record(TABLES['personal'], existing_record['id'], personal_fields)
+                    else:
+                        self.create_record(TABLES['personal'], personal_fields)
                 
-                for exp in data['experience']:
-                    exp_data = {
-                        'fields': {
+                if 'experience' in data:
+                    for exp in self.find_applicant_records(TABLES['experience'], applicant_id):
+                        self.delete_record(TABLES['experience'], exp['id'])
+                    
+                    for exp in data['experience']:
+                        self.create_record(TABLES['experience'], {
                             'Applicant ID': [applicant_id],
                             'Company': exp.get('company', ''),
                             'Title': exp.get('title', ''),
                             'Start Date': exp.get('start', ''),
                             'End Date': exp.get('end', ''),
                             'Technologies': exp.get('technologies', '')
-                        }
-                    }
-                    self.airtable_request('POST', TABLES['experience'], exp_data)
-            
-            if 'salary' in data:
-                salary_data = {
-                    'fields': {
+                        })
+                
+                if 'salary' in data:
+                    salary_fields = {
                         'Applicant ID': [applicant_id],
                         'Preferred Rate': data['salary'].get('preferred_rate', 0),
                         'Minimum Rate': data['salary'].get('minimum_rate', 0),
                         'Currency': data['salary'].get('currency', 'USD'),
                         'Availability': data['salary'].get('availability', 0)
                     }
-                }
-                
-                existing = self.get_all_records(TABLES['salary'])
-                existing_record = next((r for r in existing 
-                                      if applicant_id in r.get('fields', {}).get('Applicant ID', [])), None)
-                
-                if existing_record:
-                    self.airtable_request('PATCH', f"{TABLES['salary']}/{existing_record['id']}", 
-                                        {'fields': salary_data['fields']})
-                else:
-                    self.airtable_request('POST', TABLES['salary'], salary_data)
+                    
+                    existing_record = next(iter(self.find_applicant_records(TABLES['salary'], applicant_id)), None)
+                    
+                    if existing_record:
+                        self.update_record(TABLES['salary'], existing_record['id'], salary_fields)
+                    else:
+                        self.create_record(TABLES['salary'], salary_fields)
             
             logging.info(f"Decompressed data for applicant {applicant_id}")
             return True
@@ -264,47 +964,29 @@ class MercorAirtableSystem:
             return False
     
     def calculate_experience_years(self, experience: List[Dict]) -> float:
-        """Calculate total years of experience"""
-        total_months = 0
-        
-        for exp in experience:
-            try:
-                start_date = datetime.strptime(exp.get('start', ''), '%Y-%m-%d')
-                end_str = exp.get('end', '')
-                
-                if end_str and end_str.lower() != 'present':
-                    end_date = datetime.strptime(end_str, '%Y-%m-%d')
-                else:
-                    end_date = datetime.now()
-                
-                months = (end_date.year - start_date.year) * 12 + (end_date.month - start_date.month)
-                total_months += max(0, months)
-                
-            except ValueError:
-                continue
-        
-        return total_months / 12.0
+        """Calculate total years of experience, counting overlapping roles once"""
+        now = self.reference_now or datetime.now()
+        return merged_months(tenures_of(experience), now.year * 12 + now.month - 1) / 12.0
     
     def has_tier1_experience(self, experience: List[Dict]) -> bool:
         """Check if candidate has tier-1 company experience"""
         for exp in experience:
-            company = exp.get('company', '').lower()
-            if any(tier1 in company for tier1 in TIER1_COMPANIES):
+            if TIER1_MATCHER.matches(exp.get('company', '')):
                 return True
         return False
     
     def evaluate_shortlist_criteria(self, compressed_json: str) -> tuple[bool, str]:
         """Evaluate if candidate meets shortlist criteria"""
         try:
-            data = json.loads(compressed_json)
+            data = codec.decode_profile(compressed_json)
             reasons = []
             
             experience_years = self.calculate_experience_years(data.get('experience', []))
             has_tier1 = self.has_tier1_experience(data.get('experience', []))
             
-            experience_passed = experience_years >= 4 or has_tier1
+            experience_passed = experience_years >= MIN_EXPERIENCE_YEARS or has_tier1
             if experience_passed:
-                if experience_years >= 4:
+                if experience_years >= MIN_EXPERIENCE_YEARS:
                     reasons.append(f"{experience_years:.1f} years experience")
                 if has_tier1:
                     reasons.append("Tier-1 company experience")
@@ -313,12 +995,12 @@ class MercorAirtableSystem:
             preferred_rate = salary.get('preferred_rate', 0)
             availability = salary.get('availability', 0)
             
-            compensation_passed = preferred_rate <= 100 and availability >= 20
+            compensation_passed = preferred_rate <= MAX_HOURLY_RATE and availability >= MIN_AVAILABILITY_HOURS
             if compensation_passed:
                 reasons.append(f"Rate ${preferred_rate}/hr, {availability}hrs/week available")
             
             location = data.get('personal', {}).get('location', '').lower()
-            location_passed = any(qual_loc in location for qual_loc in QUALIFIED_LOCATIONS)
+            location_passed = LOCATION_MATCHER.matches(location)
             if location_passed:
                 reasons.append(f"Located in {location}")
             
@@ -331,131 +1013,181 @@ class MercorAirtableSystem:
             logging.error(f"Error evaluating shortlist criteria: {e}")
             return False, "Error in evaluation"
     
-    def process_shortlist(self, applicant_id: str) -> bool:
-        """Process shortlist evaluation for an applicant"""
+    def shortlist_decision(self, applicant_id: str, record_id: str, compressed_json: str) -> tuple[Dict, Optional[Dict]]:
+        """Evaluate shortlist rules, returning the applicant's field updates and the lead to create, if any"""
+        passed, reason = self.evaluate_shortlist_criteria(compressed_json)
+        status = 'Shortlisted' if passed else 'Not Qualified'
+        
+        lead = None
+        if passed:
+            lead = {
+                'Applicant': [record_id],
+                'Compressed JSON': compressed_json,
+                'Score Reason': reason
+            }
+        
+        logging.info(f"Shortlist processed for {applicant_id}: {status} - {reason}")
+        return {'Shortlist Status': status}, lead
+    
+    def process_shortlist(self, applicant_id: str, compressed_json: str = None) -> bool:
+        """Process shortlist evaluation for an applicant, on their saved Compressed JSON unless given"""
         try:
-            applicants = self.get_all_records(TABLES['applicants'])
-            applicant = next((a for a in applicants if a['fields'].get('Applicant ID') == applicant_id), None)
+            applicant = self.find_applicant(applicant_id)
             
             if not applicant:
                 logging.error(f"Applicant {applicant_id} not found")
                 return False
             
-            compressed_json = applicant['fields'].get('Compressed JSON', '')
+            compressed_json = compressed_json or applicant['fields'].get('Compressed JSON', '')
             if not compressed_json:
                 logging.warning(f"No compressed JSON found for {applicant_id}")
                 return False
             
-            passed, reason = self.evaluate_shortlist_criteria(compressed_json)
-            
-            status = 'Shortlisted' if passed else 'Not Qualified'
-            self.airtable_request('PATCH', f"{TABLES['applicants']}/{applicant['id']}", {
-                'fields': {'Shortlist Status': status}
-            })
+            fields, lead = self.shortlist_decision(applicant_id, applicant['id'], compressed_json)
+            self.update_record(TABLES['applicants'], applicant['id'], fields)
             
-            if passed:
-                shortlist_data = {
-                    'fields': {
-                        'Applicant': [applicant['id']],
-                        'Compressed JSON': compressed_json,
-                        'Score Reason': reason
-                    }
-                }
-                self.airtable_request('POST', TABLES['shortlisted'], shortlist_data)
+            if lead:
+                self.create_record(TABLES['shortlisted'], lead)
                 logging.info(f"Created shortlisted lead for {applicant_id}")
             
-            logging.info(f"Shortlist processed for {applicant_id}: {status} - {reason}")
             return True
             
         except Exception as e:
             logging.error(f"Error processing shortlist for {applicant_id}: {e}")
             return False
     
+    def rescore_shortlists(self) -> Dict[str, int]:
+        """Re-apply the shortlist rules to every compressed profile in one pass"""
+        results = {'evaluated': 0, 'changed': 0, 'shortlisted': 0, 'errors': 0}
+        try:
+            applicants = self.load_table(TABLES['applicants'],
+                                         fields=RESCORE_FIELDS)
+            profiles = [(record['id'], record['fields']['Compressed JSON'])
+                        for record in applicants if record['fields'].get('Compressed JSON')]
+            
+            started = time.perf_counter()
+            decisions = ProfileColumns(profiles).evaluate(SHORTLIST_RULES)
+            logging.info(f"Evaluated shortlist rules for {len(decisions)} profiles "
+                         f"in {time.perf_counter() - started:.2f}s")
+            
+            with self.buffered_writes():
+                for record in applicants:
+                    if record['id'] not in decisions:
+                        continue
+                    
+                    passed, reason = decisions[record['id']]
+                    status = 'Shortlisted' if passed else 'Not Qualified'
+                    results['evaluated'] += 1
+                    results['shortlisted'] += passed
+                    results['errors'] += reason == "Error in evaluation"
+                    # Only status changes are written, so only new shortlists get a lead
+                    if status == record['fields'].get('Shortlist Status'):
+                        continue
+                    
+                    results['changed'] += 1
+                    self.update_record(TABLES['applicants'], record['id'], {'Shortlist Status': status})
+                    if passed:
+                        self.create_record(TABLES['shortlisted'], {
+                            'Applicant': [record['id']],
+                            'Compressed JSON': record['fields']['Compressed JSON'],
+                            'Score Reason': reason
+                        })
+            
+            logging.info(f"Shortlist rescore completed: {results}")
+            return results
+            
+        except Exception as e:
+            logging.error(f"Error rescoring shortlists: {e}")
+            results['errors'] += 1
+            return results
+    
     def llm_evaluation(self, applicant_id: str, compressed_json: str) -> Dict:
-        """Evaluate applicant using Gemini LLM"""
-        prompt = f"""
-You are a recruiting analyst. Given this JSON applicant profile, do four things:
-
-1. Provide a concise 75-word summary.
-2. Rate overall candidate quality from 1-10 (higher is better).
-3. List any data gaps or inconsistencies you notice.
-4. Suggest up to three follow-up questions to clarify gaps.
-
-Applicant Profile JSON:
-{compressed_json}
-
-Return exactly in this format:
-Summary: <text>
-Score: <integer>
-Issues: <comma-separated list or 'None'>
-Follow-Ups: <bullet list>
-"""
+        """Evaluate applicant using the configured LLM backend"""
+        cache_key = None
+        if self.llm_cache:
+            cache_key = LLMCache.make_key(compressed_json, LLM_EVALUATION_PROMPT, self.llm_backend.name)
+            cached = self.llm_cache.get(cache_key)
+            if cached:
+                self.metrics.inc('llm_requests_total', outcome='cache_hit')
+                logging.info(f"LLM evaluation served from cache for {applicant_id}")
+                return cached
         
-        max_retries = 3
+        prompt = LLM_EVALUATION_PROMPT.format(compressed_json=compressed_json)
+        
+        max_retries = GEMINI_CONFIG['max_retries']
         for attempt in range(max_retries):
             try:
-                response = self.gemini_model.generate_content(prompt)
+                self.llm_rate_limiter.acquire()
+                with self.metrics.timer('llm_request_seconds', backend=self.llm_backend.name):
+                    text = self.llm_backend.generate(prompt)
                 
-                if response.text:
-                    lines = response.text.strip().split('\n')
-                    result = {'summary': '', 'score': 0, 'issues': '', 'follow_ups': ''}
-                    
-                    for line in lines:
-                        if line.startswith('Summary:'):
-                            result['summary'] = line.replace('Summary:', '').strip()
-                        elif line.startswith('Score:'):
-                            try:
-                                result['score'] = int(line.replace('Score:', '').strip())
-                            except ValueError:
-                                result['score'] = 5
-                        elif line.startswith('Issues:'):
-                            result['issues'] = line.replace('Issues:', '').strip()
-                        elif line.startswith('Follow-Ups:'):
-                            result['follow_ups'] = line.replace('Follow-Ups:', '').strip()
-                        elif line.startswith('•') or line.startswith('-'):
-                            result['follow_ups'] += '\n' + line.strip()
-                    
-                    logging.info(f"LLM evaluation completed for {applicant_id}")
-                    return result
+                if not text:
+                    self.metrics.inc('llm_requests_total', outcome='malformed')
+                    raise LLMError("Empty response")
+                
+                lines = text.strip().split('\n')
+                result = {'summary': '', 'score': 0, 'issues': '', 'follow_ups': ''}
+                
+                for line in lines:
+                    if line.startswith('Summary:'):
+                        result['summary'] = line.replace('Summary:', '').strip()
+                    elif line.startswith('Score:'):
+                        try:
+                            result['score'] = int(line.replace('Score:', '').strip())
+                        except ValueError:
+                            result['score'] = 5
+                    elif line.startswith('Issues:'):
+                        result['issues'] = line.replace('Issues:', '').strip()
+                    elif line.startswith('Follow-Ups:'):
+                        result['follow_ups'] = line.replace('Follow-Ups:', '').strip()
+                    elif line.startswith('•') or line.startswith('-'):
+                        result['follow_ups'] += '\n' + line.strip()
+                
+                if not result['summary']:
+                    self.metrics.inc('llm_requests_total', outcome='malformed')
+                    raise LLMError(f"Malformed response: {text[:80]!r}")
+                
+                if cache_key:
+                    self.llm_cache.put(cache_key, result)
+                
+                self.metrics.inc('llm_requests_total', outcome='success')
+                logging.info(f"LLM evaluation completed for {applicant_id}")
+                return result
                 
             except Exception as e:
-                if attempt == max_retries - 1:
-                    logging.error(f"LLM evaluation failed after {max_retries} attempts: {e}")
+                permanent = isinstance(e, LLMPermanentError)
+                if permanent or attempt == max_retries - 1:
+                    attempts = 'a non-retryable error' if permanent else f"{max_retries} attempts"
+                    self.metrics.inc('llm_requests_total', outcome='failed')
+                    logging.error(f"LLM evaluation failed after {attempts}: {e}")
                     return {
-                        'summary': 'LLM evaluation failed',
+                        'summary': LLM_FAILED_SUMMARY,
                         'score': 0,
                         'issues': 'API error',
                         'follow_ups': 'Retry evaluation'
                     }
                 
                 wait_time = 2 ** attempt
+                self.metrics.inc('llm_retries_total')
                 logging.warning(f"LLM request failed, retrying in {wait_time}s: {e}")
                 time.sleep(wait_time)
     
-    def process_llm_evaluation(self, applicant_id: str) -> bool:
-        """Process LLM evaluation for an applicant"""
+    def process_llm_evaluation(self, applicant_id: str, compressed_json: str = None) -> bool:
+        """Process LLM evaluation for an applicant, on their saved Compressed JSON unless given"""
         try:
-            applicants = self.get_all_records(TABLES['applicants'])
-            applicant = next((a for a in applicants if a['fields'].get('Applicant ID') == applicant_id), None)
+            applicant = self.find_applicant(applicant_id)
             
             if not applicant:
                 logging.error(f"Applicant {applicant_id} not found")
                 return False
             
-            compressed_json = applicant['fields'].get('Compressed JSON', '')
+            compressed_json = compressed_json or applicant['fields'].get('Compressed JSON', '')
             if not compressed_json:
                 logging.warning(f"No compressed JSON found for {applicant_id}")
                 return False
             
             evaluation = self.llm_evaluation(applicant_id, compressed_json)
-            
-            self.airtable_request('PATCH', f"{TABLES['applicants']}/{applicant['id']}", {
-                'fields': {
-                    'LLM Summary': evaluation['summary'],
-                    'LLM Score': evaluation['score'],
-                    'LLM Follow-Ups': evaluation['follow_ups']
-                }
-            })
+            self.update_record(TABLES['applicants'], applicant['id'], llm_result_fields(evaluation))
             
             logging.info(f"LLM evaluation updated for {applicant_id}")
             return True
@@ -464,50 +1196,287 @@ Follow-Ups: <bullet list>
             logging.error(f"Error processing LLM evaluation for {applicant_id}: {e}")
             return False
     
-    def process_all_applicants(self) -> Dict[str, int]:
+    def process_all_applicants(self, incremental: bool = False, applicant_ids: List[str] = None,
+                               shard_index: int = 0, shard_count: int = 1, resume: bool = True) -> Dict[str, Any]:
         """Process all applicants through the complete pipeline"""
         results = {
             'compressed': 0,
             'shortlisted': 0,
             'llm_evaluated': 0,
+            'skipped': 0,
             'errors': 0
         }
+        run_started = datetime.now(timezone.utc).isoformat()
+        self.reference_now = datetime.now()
+        metrics_start = self.metrics.snapshot()
+        scope = f"shard {shard_index}/{shard_count}" if shard_count > 1 else ''
+        
+        # Each shard worker leases its applicants and uses 1/shard_count of the rate budgets
+        if shard_count > 1:
+            self.rate_limiter.share(shard_count)
+            self.llm_rate_limiter.share(shard_count)
+            self.lease_owner = f"{socket.gethostname()}:{os.getpid()}"
+            self.lease_since = time.time()
         
         try:
-            applicants = self.get_all_records(TABLES['applicants'])
+            # Stages journaled with an unchanged input hash are skipped when resuming
+            self._checkpoints = self.run_state.load_checkpoints() if resume else {}
+            if self.replica:
+                # Decide on current data rather than whatever the staleness window allows
+                self.sync_replica()
             
-            for applicant in applicants:
-                applicant_id = applicant['fields'].get('Applicant ID')
-                if not applicant_id:
-                    continue
+            with self.snapshot_run(), self.buffered_writes():
+                selected = set(applicant_ids) if applicant_ids is not None else None
+                if selected is None and incremental:
+                    selected = self.find_changed_applicants(scope)
+                    if selected is None:
+                        logging.info("No previous run recorded, processing all applicants")
+                    else:
+                        logging.info(f"Incremental run: {len(selected)} applicants changed")
                 
-                try:
-                    compressed_data = self.compress_to_json(applicant_id)
-                    if compressed_data:
-                        compressed_json = json.dumps(compressed_data)
-                        
-                        self.airtable_request('PATCH', f"{TABLES['applicants']}/{applicant['id']}", {
-                            'fields': {'Compressed JSON': compressed_json}
-                        })
-                        results['compressed'] += 1
-                        
-                        if self.process_shortlist(applicant_id):
-                            results['shortlisted'] += 1
-                        
-                        if self.process_llm_evaluation(applicant_id):
-                            results['llm_evaluated'] += 1
+                if shard_count > 1:
+                    if selected is None:
+                        selected = {applicant_id
+                                    for record in self.load_table(TABLES['applicants'], fields=ID_FIELDS)
+                                    for applicant_id in applicant_ids_of(record)}
+                    selected = {a for a in selected if shard_of(a, shard_count) == shard_index}
+                    logging.info(f"Shard {shard_index}/{shard_count}: {len(selected)} applicants")
                 
-                except Exception as e:
-                    logging.error(f"Error processing applicant {applicant_id}: {e}")
-                    results['errors'] += 1
+                if selected is not None:
+                    self.preload_applicants(selected, BATCH_FIELDS)
+                    self.warm_snapshot()
+                    applicants = self.get_table_records(TABLES['applicants'])
+                else:
+                    # Applicants stream through the pipeline rather than sit in memory;
+                    # child rows come from replica indexes, or without it a snapshot
+                    if not self.replica:
+                        self.warm_snapshot(LINKED_TABLES)
+                    applicants = self.iter_records(TABLES['applicants'], fields=BATCH_FIELDS[TABLES['applicants']])
+                
+                pipeline = StagedPipeline([
+                    Stage('compress', self._compress_stage),
+                    Stage('shortlist', self._shortlist_stage),
+                    Stage('llm', self._llm_stage, workers=SYSTEM_SETTINGS['llm_concurrency']),
+                    Stage('write', lambda job: self._write_stage(job, results))
+                ], queue_size=SYSTEM_SETTINGS['pipeline_queue_size'], metrics=self.metrics)
+                
+                results['errors'] += pipeline.run(a for a in applicants if a['fields'].get('Applicant ID'))
+                self._commit_writes()
+            
+            if not results['errors'] and not self.dry_run and applicant_ids is None:
+                self.run_state.set_high_water_marks(INPUT_FIELDS, run_started, scope)
             
             logging.info(f"Batch processing completed: {results}")
-            return results
             
         except Exception as e:
             logging.error(f"Error in batch processing: {e}")
             results['errors'] += 1
-            return results
+        
+        finally:
+            self._checkpoints = {}
+            if self.lease_owner and self._queued_jobs:
+                # Writes that never reached Airtable; let another worker redo them
+                self.run_state.release_many([job['applicant_id'] for job in self._queued_jobs], self.lease_owner)
+            self._queued_jobs = []
+            if shard_count > 1:
+                self.rate_limiter.share(1)
+                self.llm_rate_limiter.share(1)
+                self.lease_owner = None
+            self.reference_now = None
+        
+        results['metrics'] = self.metrics.summary(since=metrics_start)
+        self.export_metrics()
+        return results
+    
+    def export_metrics(self):
+        """Rewrite the metrics text file, if one is configured"""
+        if not METRICS_SETTINGS['textfile_path']:
+            return
+        try:
+            self.metrics.write_textfile(METRICS_SETTINGS['textfile_path'])
+        except OSError as e:
+            logging.error(f"Failed to write metrics to {METRICS_SETTINGS['textfile_path']}: {e}")
+    
+    def _commit_writes(self):
+        """Flush queued writes, then journal the stages and release the leases of the jobs they complete"""
+        failed = set()
+        if self._write_buffer is not None:
+            # A retryable failure raises here, keeping the jobs queued until their writes are accepted
+            self._write_buffer.flush()
+            failed = self._write_buffer.failed
+        
+        # Jobs with rejected writes are neither journaled nor marked finished, so a later run redoes them
+        done = [job for job in self._queued_jobs if job['applicant_id'] not in failed]
+        if not self.dry_run:
+            self.run_state.record_checkpoints((job['applicant_id'], job['checkpoints'])
+                                              for job in done if job['checkpoints'])
+        if self.lease_owner:
+            self.run_state.release_many([job['applicant_id'] for job in done], self.lease_owner,
+                                        finished=not self.dry_run)
+            self.run_state.release_many([job['applicant_id'] for job in self._queued_jobs
+                                         if job['applicant_id'] in failed], self.lease_owner)
+        self._queued_jobs = []
+    
+    def warm_snapshot(self, table_names: Iterable[str] = tuple(INPUT_FIELDS)):
+        """Load and index input tables so pipeline threads only read the snapshot"""
+        missing = [table_name for table_name in table_names if table_name not in self._snapshots]
+        for table_name, records in self.load_tables(missing, BATCH_FIELDS).items():
+            self._snapshots[table_name] = TableSnapshot(records)
+        
+        for table_name in table_names:
+            snapshot = self._snapshots[table_name]
+            snapshot.by_id()
+            snapshot.by_applicant()
+    
+    def _compress_stage(self, applicant: Dict) -> Optional[Dict]:
+        applicant_id = applicant['fields']['Applicant ID']
+        compressed_data = self.compress_to_json(applicant_id)
+        if not compressed_data:
+            return None
+        
+        if self.lease_owner and not self.run_state.claim(applicant_id, self.lease_owner, self.lease_since,
+                                                         RUN_STATE_SETTINGS['lease_ttl_seconds']):
+            logging.info(f"Skipping {applicant_id}, leased or already finished by another worker")
+            return None
+        
+        compressed_json = codec.dumps(compressed_data)
+        input_hash = stage_hash(compressed_json)
+        job = {
+            'applicant_id': applicant_id,
+            'record_id': applicant['id'],
+            'compressed_json': compressed_json,
+            'input_hash': input_hash,
+            'status': applicant['fields'].get('Shortlist Status'),
+            'open_ended': any(end == PRESENT for _, end in tenures_of(compressed_data.get('experience', []))),
+            'done': self._checkpoints.get(applicant_id, {}),
+            'checkpoints': {},
+            'fields': {},
+            'lead': None,
+            'shortlisted': False,
+            'llm_evaluated': False
+        }
+        
+        if job['done'].get('compress') != input_hash:
+            job['fields']['Compressed JSON'] = compressed_json
+            job['checkpoints']['compress'] = input_hash
+        return job
+    
+    def stage_input_hash(self, stage: str, profile_hash: str, open_ended: bool = False) -> str:
+        """Checkpoint hash of a stage, given the hash of the compressed profile it runs on"""
+        if stage == 'shortlist' and open_ended:
+            # Ongoing roles keep adding experience, so those profiles are re-checked every month
+            now = self.reference_now or datetime.now()
+            return stage_hash(profile_hash, SHORTLIST_RULES_KEY, str(now.year * 12 + now.month - 1))
+        if stage == 'shortlist':
+            return stage_hash(profile_hash, SHORTLIST_RULES_KEY)
+        if stage == 'llm':
+            return stage_hash(profile_hash, LLM_EVALUATION_PROMPT, self.llm_backend.name)
+        return profile_hash
+    
+    def _shortlist_stage(self, job: Dict) -> Dict:
+        input_hash = self.stage_input_hash('shortlist', job['input_hash'], job['open_ended'])
+        if job['done'].get('shortlist') == input_hash:
+            return job
+        
+        try:
+            fields, lead = self.shortlist_decision(job['applicant_id'], job['record_id'], job['compressed_json'])
+            if job['done'].get('compress') != job['input_hash'] or fields['Shortlist Status'] != job['status']:
+                # A re-check of an unchanged profile only writes, and adds a lead, when the status changes
+                job['fields'].update(fields)
+                job['lead'] = lead
+                job['shortlisted'] = True
+            job['checkpoints']['shortlist'] = input_hash
+        except Exception as e:
+            logging.error(f"Error processing shortlist for {job['applicant_id']}: {e}")
+        return job
+    
+    def _llm_stage(self, job: Dict) -> Dict:
+        input_hash = self.stage_input_hash('llm', job['input_hash'])
+        if job['done'].get('llm') == input_hash:
+            return job
+        
+        try:
+            evaluation = self.llm_evaluation(job['applicant_id'], job['compressed_json'])
+            job['fields'].update(llm_result_fields(evaluation))
+            job['llm_evaluated'] = True
+            if evaluation['summary'] != LLM_FAILED_SUMMARY:
+                job['checkpoints']['llm'] = input_hash
+        except Exception as e:
+            logging.error(f"Error processing LLM evaluation for {job['applicant_id']}: {e}")
+        return job
+    
+    def _write_stage(self, job: Dict, results: Dict[str, int]):
+        # The only stage that touches the write buffer, so it needs no locking
+        if job['fields']:
+            self.update_record(TABLES['applicants'], job['record_id'], job['fields'], key=job['applicant_id'])
+            if job['lead']:
+                self.create_record(TABLES['shortlisted'], job['lead'], key=job['applicant_id'])
+            
+            results['compressed'] += 'Compressed JSON' in job['fields']
+            results['shortlisted'] += job['shortlisted']
+            results['llm_evaluated'] += job['llm_evaluated']
+        else:
+            results['skipped'] += 1
+        
+        # Stages only count as done, and leases are only given up, once the writes are in Airtable
+        self._queued_jobs.append(job)
+        if len(self._queued_jobs) >= RUN_STATE_SETTINGS['commit_interval']:
+            self._commit_writes()
+    
+    def compress_applicant(self, applicant_id: str) -> Optional[str]:
+        """Compress an applicant's tables and save the JSON on their Applicants record; returns the JSON"""
+        compressed_data = self.compress_to_json(applicant_id)
+        if not compressed_data:
+            print(f"Failed to compress data for {applicant_id}")
+            return None
+        
+        applicant = self.find_applicant(applicant_id)
+        if not applicant:
+            print(f"Applicant {applicant_id} not found")
+            return None
+        
+        compressed_json = codec.dumps(compressed_data)
+        self.update_record(TABLES['applicants'], applicant['id'], {'Compressed JSON': compressed_json})
+        return compressed_json
+    
+    def decompress_applicant(self, applicant_id: str) -> bool:
+        """Restore an applicant's child tables from their saved Compressed JSON"""
+        applicant = self.find_applicant(applicant_id)
+        
+        if not applicant or not applicant['fields'].get('Compressed JSON'):
+            print(f"No compressed data found for {applicant_id}")
+            return False
+        
+        if not self.decompress_from_json(applicant_id, applicant['fields']['Compressed JSON']):
+            print(f"Failed to decompress data for {applicant_id}")
+            return False
+        return True
+    
+    def process_applicant(self, applicant_id: str) -> bool:
+        """Run one applicant through compress, shortlist and LLM evaluation"""
+        print(f"Processing {applicant_id}...")
+        
+        compressed_json = self.compress_applicant(applicant_id)
+        if not compressed_json:
+            return False
+        
+        # Passed on rather than read back, since the save may still be queued (or skipped in a dry run)
+        shortlist_success = self.process_shortlist(applicant_id, compressed_json)
+        llm_success = self.process_llm_evaluation(applicant_id, compressed_json)
+        
+        print(f"Full processing completed for {applicant_id}")
+        print(f"   - Data compressed: Success")
+        print(f"   - Shortlist processed: {'Success' if shortlist_success else 'Failed'}")
+        print(f"   - LLM evaluation: {'Success' if llm_success else 'Failed'}")
+        return shortlist_success and llm_success
+    
+    def print_batch_results(self, results: Dict[str, int]):
+        print("\nBatch Processing Results:")
+        print(f"   - Compressed: {results['compressed']}")
+        print(f"   - Shortlisted: {results['shortlisted']}")
+        print(f"   - LLM Evaluated: {results['llm_evaluated']}")
+        print(f"   - Skipped (already done): {results['skipped']}")
+        print(f"   - Errors: {results['errors']}")
     
     def interactive_menu(self):
         """Interactive menu for system operations"""
@@ -529,35 +1498,13 @@ Follow-Ups: <bullet list>
             
             if choice == '1':
                 applicant_id = input("Enter Applicant ID: ").strip()
-                if applicant_id:
-                    compressed_data = self.compress_to_json(applicant_id)
-                    if compressed_data:
-                        applicants = self.get_all_records(TABLES['applicants'])
-                        applicant = next((a for a in applicants if a['fields'].get('Applicant ID') == applicant_id), None)
-                        
-                        if applicant:
-                            self.airtable_request('PATCH', f"{TABLES['applicants']}/{applicant['id']}", {
-                                'fields': {'Compressed JSON': json.dumps(compressed_data)}
-                            })
-                            print(f"Data compressed successfully for {applicant_id}")
-                        else:
-                            print(f"Applicant {applicant_id} not found")
-                    else:
-                        print(f"Failed to compress data for {applicant_id}")
+                if applicant_id and self.compress_applicant(applicant_id):
+                    print(f"Data compressed successfully for {applicant_id}")
             
             elif choice == '2':
                 applicant_id = input("Enter Applicant ID: ").strip()
-                if applicant_id:
-                    applicants = self.get_all_records(TABLES['applicants'])
-                    applicant = next((a for a in applicants if a['fields'].get('Applicant ID') == applicant_id), None)
-                    
-                    if applicant and applicant['fields'].get('Compressed JSON'):
-                        if self.decompress_from_json(applicant_id, applicant['fields']['Compressed JSON']):
-                            print(f"Data decompressed successfully for {applicant_id}")
-                        else:
-                            print(f"Failed to decompress data for {applicant_id}")
-                    else:
-                        print(f"No compressed data found for {applicant_id}")
+                if applicant_id and self.decompress_applicant(applicant_id):
+                    print(f"Data decompressed successfully for {applicant_id}")
             
             elif choice == '3':
                 applicant_id = input("Enter Applicant ID: ").strip()
@@ -578,38 +1525,11 @@ Follow-Ups: <bullet list>
             elif choice == '5':
                 applicant_id = input("Enter Applicant ID: ").strip()
                 if applicant_id:
-                    print(f"Processing {applicant_id}...")
-                    
-                    compressed_data = self.compress_to_json(applicant_id)
-                    if compressed_data:
-                        applicants = self.get_all_records(TABLES['applicants'])
-                        applicant = next((a for a in applicants if a['fields'].get('Applicant ID') == applicant_id), None)
-                        
-                        if applicant:
-                            self.airtable_request('PATCH', f"{TABLES['applicants']}/{applicant['id']}", {
-                                'fields': {'Compressed JSON': json.dumps(compressed_data)}
-                            })
-                            
-                            shortlist_success = self.process_shortlist(applicant_id)
-                            llm_success = self.process_llm_evaluation(applicant_id)
-                            
-                            print(f"Full processing completed for {applicant_id}")
-                            print(f"   - Data compressed: Success")
-                            print(f"   - Shortlist processed: {'Success' if shortlist_success else 'Failed'}")
-                            print(f"   - LLM evaluation: {'Success' if llm_success else 'Failed'}")
-                        else:
-                            print(f"Applicant {applicant_id} not found")
-                    else:
-                        print(f"Failed to compress data for {applicant_id}")
+                    self.process_applicant(applicant_id)
             
             elif choice == '6':
                 print("Processing all applicants... This may take a while.")
-                results = self.process_all_applicants()
-                print("\nBatch Processing Results:")
-                print(f"   - Compressed: {results['compressed']}")
-                print(f"   - Shortlisted: {results['shortlisted']}")
-                print(f"   - LLM Evaluated: {results['llm_evaluated']}")
-                print(f"   - Errors: {results['errors']}")
+                self.print_batch_results(self.process_all_applicants())
             
             elif choice == '7':
                 self.show_system_stats()
@@ -627,51 +1547,209 @@ Follow-Ups: <bullet list>
             print("\nSYSTEM STATISTICS")
             print("-"*30)
             
-            applicants = self.get_all_records(TABLES['applicants'])
-            personal = self.get_all_records(TABLES['personal'])
-            experience = self.get_all_records(TABLES['experience'])
-            salary = self.get_all_records(TABLES['salary'])
-            shortlisted = self.get_all_records(TABLES['shortlisted'])
+            # Counted page by page as the tables stream in, so no table is held whole
+            counts = {table_name: 0 for table_name in TABLES.values()}
+            present = {field: 0 for field in STATS_PRESENCE_FIELDS}
+            shortlisted_count = 0
+            score_total = score_count = 0
+            if self.replica:
+                pages = self.stream_tables(TABLES.values())
+            else:
+                listings = {table_name: (table_name, {'fields': STATS_FIELDS[table_name]})
+                            for table_name in TABLES.values()}
+                listings.update({field: (TABLES['applicants'], {'formula': f"{{{field}}} != ''", 'fields': ID_FIELDS})
+                                 for field in STATS_PRESENCE_FIELDS})
+                pages = self.stream_listings(listings)
             
-            print(f"Total Applicants: {len(applicants)}")
-            print(f"Personal Details: {len(personal)}")
-            print(f"Work Experience Records: {len(experience)}")
-            print(f"Salary Preferences: {len(salary)}")
-            print(f"Shortlisted Candidates: {len(shortlisted)}")
+            for key, page in pages:
+                if key in present:
+                    present[key] += len(page)
+                    continue
+                counts[key] += len(page)
+                if key != TABLES['applicants']:
+                    continue
+                for a in page:
+                    if self.replica:
+                        for field in present:
+                            present[field] += bool(a['fields'].get(field))
+                    shortlisted_count += a['fields'].get('Shortlist Status') == 'Shortlisted'
+                    if a['fields'].get('LLM Score'):
+                        score_total += a['fields']['LLM Score']
+                        score_count += 1
             
-            compressed_count = sum(1 for a in applicants if a['fields'].get('Compressed JSON'))
-            shortlisted_count = sum(1 for a in applicants if a['fields'].get('Shortlist Status') == 'Shortlisted')
-            llm_evaluated = sum(1 for a in applicants if a['fields'].get('LLM Summary'))
+            total = counts[TABLES['applicants']]
+            print(f"Total Applicants: {total}")
+            print(f"Personal Details: {counts[TABLES['personal']]}")
+            print(f"Work Experience Records: {counts[TABLES['experience']]}")
+            print(f"Salary Preferences: {counts[TABLES['salary']]}")
+            print(f"Shortlisted Candidates: {counts[TABLES['shortlisted']]}")
             
             print(f"\nProcessing Status:")
-            print(f"- Compressed JSON: {compressed_count}/{len(applicants)}")
-            print(f"- Shortlisted: {shortlisted_count}/{len(applicants)}")
-            print(f"- LLM Evaluated: {llm_evaluated}/{len(applicants)}")
+            print(f"- Compressed JSON: {present['Compressed JSON']}/{total}")
+            print(f"- Shortlisted: {shortlisted_count}/{total}")
+            print(f"- LLM Evaluated: {present['LLM Summary']}/{total}")
             
-            scores = [a['fields'].get('LLM Score', 0) for a in applicants if a['fields'].get('LLM Score')]
-            if scores:
-                avg_score = sum(scores) / len(scores)
+            if score_count:
+                avg_score = score_total / score_count
                 print(f"- Average LLM Score: {avg_score:.1f}/10")
             
         except Exception as e:
             print(f"Error getting system stats: {e}")
 
 
-def main():
+def read_applicant_ids(ids: List[str], ids_file: Optional[str]) -> List[str]:
+    """Collect applicant IDs from the command line and a file ('-' for stdin), one per line"""
+    applicant_ids = list(ids)
+    if ids_file:
+        stream = sys.stdin if ids_file == '-' else open(ids_file)
+        try:
+            applicant_ids.extend(line.strip() for line in stream if line.strip())
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+    return list(dict.fromkeys(applicant_ids))
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command-line interface mirroring the interactive menu"""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--dry-run', action='store_true',
+                        help="read and evaluate, but don't write to Airtable")
+    common.add_argument('--concurrency', type=int,
+                        help=f"parallel LLM evaluations (default {SYSTEM_SETTINGS['llm_concurrency']})")
+    common.add_argument('--llm-backend', choices=['gemini', 'fake'],
+                        help=f"LLM backend to evaluate with (default {LLM_BACKEND_SETTINGS['backend']})")
+    common.add_argument('--metrics-file', metavar='PATH',
+                        help='write Prometheus-format metrics here when the command finishes')
+    
+    parser = argparse.ArgumentParser(description="Mercor Contractor Management System. "
+                                                 "Run without a command for the interactive menu.")
+    commands = parser.add_subparsers(dest='command')
+    
+    for name, help_text in (('compress', 'compress applicant tables into JSON'),
+                            ('decompress', 'restore applicant tables from JSON'),
+                            ('shortlist', 'apply shortlist rules'),
+                            ('evaluate', 'run LLM evaluation'),
+                            ('process', 'compress, shortlist and evaluate')):
+        command = commands.add_parser(name, parents=[common], help=help_text)
+        command.add_argument('ids', nargs='*', metavar='APPLICANT_ID')
+        command.add_argument('--ids-file', metavar='PATH',
+                             help="read applicant IDs from a file, one per line ('-' for stdin)")
+    
+    batch = commands.add_parser('batch', parents=[common], help='process all applicants')
+    batch.add_argument('--incremental', action='store_true',
+                       help='only applicants changed since the last successful batch')
+    batch.add_argument('--restart', action='store_true',
+                       help='ignore the checkpoint journal and redo every stage')
+    batch.add_argument('--shard-index', type=int, default=0,
+                       help='which shard this worker processes (0-based)')
+    batch.add_argument('--shard-count', type=int, default=1,
+                       help='number of workers the batch is split across')
+    
+    commands.add_parser('rescore', parents=[common],
+                        help='re-apply shortlist rules to every compressed profile at once')
+    commands.add_parser('stats', parents=[common], help='show system statistics')
+    sync = commands.add_parser('sync', parents=[common], help='update the local read replica from Airtable')
+    sync.add_argument('--full', action='store_true', help='re-download every table, dropping deleted rows')
+    return parser
+
+def run_command(system: MercorAirtableSystem, args: argparse.Namespace) -> int:
+    """Run a CLI command; returns the process exit code"""
+    if args.command == 'stats':
+        system.show_system_stats()
+        return 0
+    
+    if args.command == 'sync':
+        fetched = system.sync_replica(full=args.full)
+        counts = system.replica.counts()
+        for table_name, count in fetched.items():
+            print(f"{table_name}: {count} records fetched, {counts.get(table_name, 0)} in replica")
+        return 0
+    
+    if args.command == 'rescore':
+        results = system.rescore_shortlists()
+        print(f"Rescored {results['evaluated']} applicants: {results['changed']} changed, "
+              f"{results['shortlisted']} shortlisted, {results['errors']} errors")
+        return 1 if results['errors'] else 0
+    
+    if args.command == 'batch':
+        if not 0 <= args.shard_index < args.shard_count:
+            print("--shard-index must be between 0 and --shard-count - 1")
+            return 2
+        results = system.process_all_applicants(incremental=args.incremental, resume=not args.restart,
+                                                shard_index=args.shard_index, shard_count=args.shard_count)
+        system.print_batch_results(results)
+        return 1 if results['errors'] else 0
+    
+    applicant_ids = read_applicant_ids(args.ids, args.ids_file)
+    if not applicant_ids:
+        print("No applicant IDs given")
+        return 2
+    
+    if args.command == 'process' and len(applicant_ids) > 1:
+        # Named applicants are always reprocessed, as 'process <id>' does for one
+        results = system.process_all_applicants(applicant_ids=applicant_ids, resume=False)
+        system.print_batch_results(results)
+        return 1 if results['errors'] else 0
+    
+    operations = {
+        'compress': system.compress_applicant,
+        'decompress': system.decompress_applicant,
+        'shortlist': system.process_shortlist,
+        'evaluate': system.process_llm_evaluation,
+        'process': system.process_applicant
+    }
+    failures = 0
+    
+    # Decompress rewrites child tables, which would invalidate a preloaded snapshot
+    preload = args.command != 'decompress' and len(applicant_ids) > 1
+    
+    with (system.snapshot_run() if preload else nullcontext()), system.buffered_writes():
+        if preload:
+            system.preload_applicants(set(applicant_ids))
+        
+        for applicant_id in applicant_ids:
+            if operations[args.command](applicant_id):
+                print(f"{args.command}: {applicant_id} OK")
+            else:
+                print(f"{args.command}: {applicant_id} FAILED")
+                failures += 1
+    
+    return 1 if failures else 0
+
+def main(argv: List[str] = None) -> int:
     """Main function to run the system"""
+    args = build_arg_parser().parse_args(argv)
+    
     try:
-        print("Starting Mercor Contractor Management System...")
+        if args.command is None:
+            print("Starting Mercor Contractor Management System...")
+            MercorAirtableSystem().interactive_menu()
+            return 0
         
-        system = MercorAirtableSystem()
-        system.interactive_menu()
+        if args.concurrency:
+            SYSTEM_SETTINGS['llm_concurrency'] = args.concurrency
+        if args.llm_backend:
+            LLM_BACKEND_SETTINGS['backend'] = args.llm_backend
+        if args.metrics_file:
+            METRICS_SETTINGS['textfile_path'] = args.metrics_file
+        if args.command == 'sync':
+            REPLICA_SETTINGS['enabled'] = True
+        
+        system = MercorAirtableSystem(dry_run=args.dry_run)
+        try:
+            return run_command(system, args)
+        finally:
+            system.export_metrics()
         
     except KeyboardInterrupt:
         print("\n\nSystem interrupted by user. Goodbye!")
+        return 130
     except Exception as e:
         logging.error(f"System error: {e}")
         print(f"System error: {e}")
         print("Please check your configuration and try again.")
+        return 1
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,204 @@
+import os
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# Latency histogram bucket bounds in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HELP = {
+    'airtable_requests_total': 'Airtable HTTP requests by method, table and status',
+    'airtable_request_seconds': 'Airtable HTTP request latency',
+    'airtable_request_bytes_total': 'Request body bytes sent to Airtable',
+    'airtable_response_bytes_total': 'Response body bytes received from Airtable',
+    'airtable_retries_total': 'Airtable requests retried, by reason',
+    'airtable_throttled_total': '429 responses from Airtable',
+    'airtable_fetch_seconds': 'Time spent waiting on Airtable while paging through a listing',
+    'airtable_pages_total': 'Listing pages fetched from Airtable',
+    'airtable_records_fetched_total': 'Records fetched from Airtable listings',
+    'llm_requests_total': 'LLM evaluations by outcome',
+    'llm_request_seconds': 'LLM backend call latency',
+    'llm_retries_total': 'LLM calls retried',
+    'pipeline_stage_seconds': 'Time a pipeline stage spends on one applicant',
+    'pipeline_items_total': 'Applicants handled by a pipeline stage, by outcome'
+}
+
+
+def _labels_key(labels: Dict[str, str]) -> Tuple:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: Tuple, extra: Tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Metrics:
+    """Thread-safe counters and latency histograms with a Prometheus text dump
+
+    Series are a metric name plus labels, e.g.
+    metrics.inc('airtable_requests_total', method='GET', table='Applicants').
+    """
+
+    def __init__(self, namespace: str = 'mercor', buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+        # Per series: [count per bucket..., count above the last bucket, total count, sum]
+        self._histograms: Dict[str, Dict[Tuple, List[float]]] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = _labels_key(labels)
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [0] * (len(self.buckets) + 1) + [0, 0.0]
+            state[index] += 1
+            state[-2] += 1
+            state[-1] += seconds
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> Dict:
+        """Copy of every series, to pass to summary(since=...) later"""
+        with self._lock:
+            return {
+                'counters': {name: dict(series) for name, series in self._counters.items()},
+                'histograms': {name: {key: list(state) for key, state in series.items()}
+                               for name, series in self._histograms.items()}
+            }
+
+    def summary(self, since: Dict = None) -> Dict:
+        """Totals and latency stats per series, minus what an earlier snapshot held"""
+        current = self.snapshot()
+        since = since or {'counters': {}, 'histograms': {}}
+
+        counters = {}
+        for name, series in current['counters'].items():
+            before = since['counters'].get(name, {})
+            values = {self._label_text(key): value - before.get(key, 0) for key, value in series.items()}
+            values = {label: value for label, value in values.items() if value}
+            if values:
+                counters[name] = values
+
+        latency = {}
+        for name, series in current['histograms'].items():
+            before = since['histograms'].get(name, {})
+            stats = {}
+            for key, state in series.items():
+                previous = before.get(key, [0] * len(state))
+                delta = [now - then for now, then in zip(state, previous)]
+                count, total = delta[-2], delta[-1]
+                if not count:
+                    continue
+                stats[self._label_text(key)] = {
+                    'count': int(count),
+                    'total_s': round(total, 3),
+                    'avg_ms': round(total / count * 1000, 3),
+                    'p50_ms': round(self._quantile(delta, 0.50) * 1000, 3),
+                    'p95_ms': round(self._quantile(delta, 0.95) * 1000, 3),
+                    'p99_ms': round(self._quantile(delta, 0.99) * 1000, 3)
+                }
+            if stats:
+                latency[name] = stats
+
+        return {'counters': counters, 'latency': latency}
+
+    def _quantile(self, state: List[float], q: float) -> float:
+        """Estimate a quantile from bucket counts, interpolating within the bucket"""
+        rank = q * state[-2]
+        seen = 0
+        for index, bound in enumerate(self.buckets):
+            if seen + state[index] >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (bound - lower) * ((rank - seen) / state[index] if state[index] else 0)
+            seen += state[index]
+        return self.buckets[-1]
+
+    @staticmethod
+    def _label_text(key: Tuple) -> str:
+        return ','.join(f"{name}={value}" for name, value in key) or 'all'
+
+    def render(self) -> str:
+        """All series in the Prometheus text exposition format"""
+        data = self.snapshot()
+        lines = []
+
+        for name in sorted(data['counters']):
+            full_name = f"{self.namespace}_{name}"
+            lines.append(f"# HELP {full_name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {full_name} counter")
+            for key, value in sorted(data['counters'][name].items()):
+                lines.append(f"{full_name}{_format_labels(key)} {value:g}")
+
+        for name in sorted(data['histograms']):
+            full_name = f"{self.namespace}_{name}"
+            lines.append(f"# HELP {full_name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {full_name} histogram")
+            for key, state in sorted(data['histograms'][name].items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, state):
+                    cumulative += count
+                    lines.append(f"{full_name}_bucket{_format_labels(key, (('le', f'{bound:g}'),))} {cumulative:g}")
+                lines.append(f"{full_name}_bucket{_format_labels(key, (('le', '+Inf'),))} {state[-2]:g}")
+                lines.append(f"{full_name}_sum{_format_labels(key)} {state[-1]:.6f}")
+                lines.append(f"{full_name}_count{_format_labels(key)} {state[-2]:g}")
+
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str):
+        """Dump the metrics to a file, e.g. for node_exporter's textfile collector"""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+    def serve(self, port: int, host: str = '127.0.0.1'):
+        """Expose the metrics at http://host:port/metrics from a background thread"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='metrics-http', daemon=True).start()
+        logging.info(f"Serving metrics at http://{host}:{port}/metrics")
@@ -0,0 +1,165 @@
+import time
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+# Marks the end of a stage's input; one is queued per downstream worker
+_DONE = object()
+
+# Marks an exception raised by a merged stream
+_FAILED = object()
+
+
+class Stage:
+    """One pipeline step, run by a fixed number of worker threads
+
+    The handler receives an item and returns the item to pass downstream,
+    or None to drop it.
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], Optional[Any]], workers: int = 1):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+
+
+class StagedPipeline:
+    """Push items through stages connected by bounded queues
+
+    Every stage runs concurrently with the others. When a stage falls behind,
+    the queue in front of it fills up and blocks the stage feeding it, so
+    memory stays bounded by the queue sizes.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 100, metrics=None):
+        self.stages = stages
+        self.metrics = metrics
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._remaining = [stage.workers for stage in stages]
+
+    def run(self, items: Iterable) -> int:
+        """Process every item and wait for all stages to drain; returns the error count"""
+        threads = [threading.Thread(target=self._feed, args=(items,), name='pipeline-feed', daemon=True)]
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.workers):
+                threads.append(threading.Thread(target=self._work, args=(index,),
+                                                name=f"pipeline-{stage.name}-{worker}", daemon=True))
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return self.errors
+
+    def _feed(self, items: Iterable):
+        try:
+            for item in items:
+                self.queues[0].put(item)
+        except Exception as e:
+            logging.error(f"Pipeline input failed: {e}")
+            self._count_error()
+        finally:
+            for _ in range(self.stages[0].workers):
+                self.queues[0].put(_DONE)
+
+    def _work(self, index: int):
+        stage = self.stages[index]
+        inbox = self.queues[index]
+        outbox = self.queues[index + 1] if index + 1 < len(self.stages) else None
+
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+
+            start = time.perf_counter()
+            try:
+                result = stage.handler(item)
+            except Exception as e:
+                logging.error(f"Pipeline stage '{stage.name}' failed: {e}")
+                self._count_error()
+                self._record(stage.name, start, 'error')
+                continue
+            self._record(stage.name, start, 'ok')
+
+            if result is not None and outbox is not None:
+                outbox.put(result)
+
+        with self._lock:
+            self._remaining[index] -= 1
+            last_worker = self._remaining[index] == 0
+
+        if last_worker and outbox is not None:
+            for _ in range(self.stages[index + 1].workers):
+                outbox.put(_DONE)
+
+    def _record(self, stage_name: str, start: float, outcome: str):
+        if self.metrics is not None:
+            self.metrics.observe('pipeline_stage_seconds', time.perf_counter() - start, stage=stage_name)
+            self.metrics.inc('pipeline_items_total', stage=stage_name, outcome=outcome)
+
+    def _count_error(self):
+        with self._lock:
+            self.errors += 1
+
+
+def merge_streams(streams: Dict[Hashable, Iterable], workers: int,
+                  queue_size: int = 4) -> Iterator[Tuple[Hashable, Any]]:
+    """Drain several iterables on worker threads, yielding (key, item) as items arrive
+
+    Up to workers streams are consumed at once, and together they run at most
+    queue_size items ahead of the caller, so e.g. the next page of a listing is
+    requested while the current one is processed. An exception in a stream is
+    re-raised to the caller; closing the generator early stops the workers.
+    """
+    pending = queue.Queue()
+    for entry in streams.items():
+        pending.put(entry)
+    output = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                output.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def work():
+        while not stop.is_set():
+            try:
+                key, stream = pending.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                for item in stream:
+                    if not put((key, item)):
+                        return
+            except Exception as e:
+                put((key, (_FAILED, e)))
+                return
+        put((None, _DONE))
+
+    threads = [threading.Thread(target=work, name=f"stream-{index}", daemon=True)
+               for index in range(min(max(1, workers), len(streams)))]
+    for thread in threads:
+        thread.start()
+
+    finished = 0
+    try:
+        while finished < len(threads):
+            key, item = output.get()
+            if item is _DONE:
+                finished += 1
+                continue
+            if isinstance(item, tuple) and len(item) == 2 and item[0] is _FAILED:
+                raise item[1]
+            yield key, item
+    finally:
+        stop.set()
@@ -0,0 +1,189 @@
+import codec
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+
+class AirtableReplica:
+    """Local copy of the Airtable tables in an indexed SQLite file
+
+    Airtable stays the system of record: the replica is filled by syncs and
+    by applying writes once Airtable has accepted them, and only serves reads.
+    Records are stored as returned by the API, with a side index from
+    Applicant ID to record so one applicant's rows are a single lookup.
+    """
+
+    def __init__(self, path: str, applicant_ids_of: Callable[[Dict], List[str]]):
+        self.path = path
+        self.applicant_ids_of = applicant_ids_of
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                table_name TEXT NOT NULL,
+                record_id TEXT NOT NULL,
+                record TEXT NOT NULL,
+                PRIMARY KEY (table_name, record_id)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS record_applicants (
+                table_name TEXT NOT NULL,
+                applicant_id TEXT NOT NULL,
+                record_id TEXT NOT NULL,
+                PRIMARY KEY (table_name, applicant_id, record_id)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_record_applicants_record ON record_applicants (table_name, record_id)"
+        )
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                table_name TEXT PRIMARY KEY,
+                synced_at TEXT NOT NULL,
+                full_synced_at REAL NOT NULL,
+                checked_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+        # Table -> when a write last went through that could not be applied as-is
+        self._stale: Dict[str, float] = {}
+
+    def sync_state(self, table_name: str) -> Optional[Dict]:
+        """Sync bookkeeping for a table, or None if it was never synced
+
+        synced_at (ISO) is the start of the last sync, which the next incremental
+        sync fetches changes after; full_synced_at and checked_at are epoch times.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at, full_synced_at, checked_at FROM sync_state WHERE table_name = ?", (table_name,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'synced_at': row[0], 'full_synced_at': row[1], 'checked_at': row[2]}
+
+    def needs_sync(self, table_name: str, max_age: float) -> bool:
+        """Whether the table was never synced, saw an unapplied write, or was last checked over max_age seconds ago"""
+        if table_name in self._stale:
+            return True
+        state = self.sync_state(table_name)
+        return state is None or time.time() - state['checked_at'] > max_age
+
+    def mark_stale(self, table_name: str):
+        """Have the next read of the table sync it first"""
+        with self._lock:
+            self._stale[table_name] = time.time()
+
+    def _synced(self, table_name: str, synced_at: datetime):
+        # A write made after the sync started may be missing from what it fetched
+        if self._stale.get(table_name, float('inf')) < synced_at.timestamp():
+            del self._stale[table_name]
+
+    def finish_sync(self, table_name: str, synced_at: datetime, listed_ids: Optional[set] = None):
+        """Record a sync whose pages have been upserted; a full sync passes every record ID it listed
+
+        Rows a full sync did not list were deleted in Airtable and are dropped.
+        """
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                if listed_ids is not None:
+                    held = {row[0] for row in self._conn.execute(
+                        "SELECT record_id FROM records WHERE table_name = ?", (table_name,))}
+                    self._remove(table_name, list(held - listed_ids))
+                previous = self._conn.execute(
+                    "SELECT full_synced_at FROM sync_state WHERE table_name = ?", (table_name,)
+                ).fetchone()
+                full_synced_at = now if listed_ids is not None or previous is None else previous[0]
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (table_name, synced_at, full_synced_at, checked_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (table_name, synced_at.isoformat(), full_synced_at, now)
+                )
+            self._synced(table_name, synced_at)
+
+    def upsert(self, table_name: str, records: List[Dict]):
+        """Apply records from a sync page or returned by a successful create or update"""
+        with self._lock:
+            with self._conn:
+                self._remove(table_name, [record['id'] for record in records])
+                self._insert(table_name, records)
+
+    def delete(self, table_name: str, record_ids: Iterable[str]):
+        """Drop records deleted through the API"""
+        with self._lock:
+            with self._conn:
+                self._remove(table_name, list(record_ids))
+
+    def _insert(self, table_name: str, records: List[Dict]):
+        self._conn.executemany(
+            "INSERT INTO records (table_name, record_id, record) VALUES (?, ?, ?)",
+            [(table_name, record['id'], codec.dumps(record)) for record in records]
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO record_applicants (table_name, applicant_id, record_id) VALUES (?, ?, ?)",
+            [(table_name, applicant_id, record['id'])
+             for record in records for applicant_id in self.applicant_ids_of(record)]
+        )
+
+    def _remove(self, table_name: str, record_ids: List[str]):
+        rows = [(table_name, record_id) for record_id in record_ids]
+        self._conn.executemany("DELETE FROM records WHERE table_name = ? AND record_id = ?", rows)
+        self._conn.executemany("DELETE FROM record_applicants WHERE table_name = ? AND record_id = ?", rows)
+
+    def records(self, table_name: str) -> List[Dict]:
+        """Every record of a table, in insertion order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record FROM records WHERE table_name = ? ORDER BY rowid", (table_name,)
+            ).fetchall()
+        return [codec.loads(row[0]) for row in rows]
+
+    def iter_pages(self, table_name: str, page_size: int = 1000) -> Iterator[List[Dict]]:
+        """Yield a table's records page by page without holding the whole table
+
+        Reads on a connection of its own, so writes carry on meanwhile; the read
+        sees the table as it was when it started, so rows rewritten during the
+        scan are not yielded twice.
+        """
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            cursor = conn.execute("SELECT record FROM records WHERE table_name = ? ORDER BY rowid", (table_name,))
+            while True:
+                rows = cursor.fetchmany(page_size)
+                if not rows:
+                    break
+                yield [codec.loads(row[0]) for row in rows]
+        finally:
+            conn.close()
+
+    def applicant_records(self, table_name: str, applicant_ids: Iterable[str]) -> List[Dict]:
+        """Records of a table that belong to any of these applicants"""
+        applicant_ids = list(applicant_ids)
+        rows = []
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(applicant_ids), 500):
+                chunk = applicant_ids[i:i + 500]
+                rows.extend(self._conn.execute(
+                    f"SELECT DISTINCT r.rowid, r.record FROM record_applicants a "
+                    f"JOIN records r ON r.table_name = a.table_name AND r.record_id = a.record_id "
+                    f"WHERE a.table_name = ? AND a.applicant_id IN ({', '.join('?' * len(chunk))})",
+                    [table_name] + chunk
+                ).fetchall())
+        rows.sort()
+        return [codec.loads(record) for _, record in dict(rows).items()]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of records held per table"""
+        with self._lock:
+            rows = self._conn.execute("SELECT table_name, COUNT(*) FROM records GROUP BY table_name").fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,116 @@
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, Iterable, Tuple
+
+
+class RunStateStore:
+    """Durable bookkeeping for batch runs, kept in a local SQLite file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Several worker processes may share the file, so wait on their locks
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS high_water_marks (
+                table_name TEXT PRIMARY KEY,
+                modified_since TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS leases (
+                applicant_id TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                finished_at REAL NOT NULL DEFAULT 0
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                applicant_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                input_hash TEXT NOT NULL,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (applicant_id, stage)
+            )
+        """)
+        self._conn.commit()
+
+    def get_high_water_marks(self, scope: str = '') -> Dict[str, str]:
+        """Table name -> ISO timestamp of the last successful run that covered it
+
+        scope keeps marks of separately run shards apart.
+        """
+        prefix = f"{scope}:" if scope else ''
+        with self._lock:
+            rows = self._conn.execute("SELECT table_name, modified_since FROM high_water_marks").fetchall()
+        return {key[len(prefix):]: value for key, value in rows
+                if key.startswith(prefix) and (scope or ':' not in key)}
+
+    def set_high_water_marks(self, table_names: Iterable[str], modified_since: str, scope: str = ''):
+        """Record that every change to these tables before modified_since has been processed"""
+        prefix = f"{scope}:" if scope else ''
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO high_water_marks (table_name, modified_since) VALUES (?, ?)",
+                [(prefix + table_name, modified_since) for table_name in table_names]
+            )
+            self._conn.commit()
+        logging.info(f"High-water mark advanced to {modified_since} ({scope or 'all applicants'})")
+
+    def claim(self, applicant_id: str, owner: str, since: float, ttl: float) -> bool:
+        """Take the lease on an applicant unless another live worker holds it
+
+        Applicants some worker finished after since (the claimant's start
+        time) are refused too, so overlapping runs don't process them twice.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO leases (applicant_id, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (applicant_id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE (leases.expires_at < ? OR leases.owner = excluded.owner) AND leases.finished_at < ?",
+                (applicant_id, owner, now + ttl, now, since)
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def release_many(self, applicant_ids: Iterable[str], owner: str, finished: bool = False):
+        """Give up leases taken with claim, marking the applicants finished if their writes are done"""
+        finished_at = time.time() if finished else 0
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE leases SET expires_at = 0, finished_at = MAX(finished_at, ?) "
+                "WHERE applicant_id = ? AND owner = ?",
+                [(finished_at, applicant_id, owner) for applicant_id in applicant_ids]
+            )
+            self._conn.commit()
+
+    def load_checkpoints(self) -> Dict[str, Dict[str, str]]:
+        """Applicant ID -> {stage: input hash} for every stage whose output reached Airtable"""
+        with self._lock:
+            rows = self._conn.execute("SELECT applicant_id, stage, input_hash FROM checkpoints").fetchall()
+
+        checkpoints = {}
+        for applicant_id, stage, input_hash in rows:
+            checkpoints.setdefault(applicant_id, {})[stage] = input_hash
+        return checkpoints
+
+    def record_checkpoints(self, entries: Iterable[Tuple[str, Dict[str, str]]]):
+        """Journal completed stages, given as (applicant ID, {stage: input hash}) pairs"""
+        now = time.time()
+        rows = [(applicant_id, stage, input_hash, now)
+                for applicant_id, stages in entries
+                for stage, input_hash in stages.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO checkpoints (applicant_id, stage, input_hash, completed_at) "
+                "VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -133,7 +133,7 @@ def test_gemini_connection():
     
     try:
         genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-pro')
+        model = genai.GenerativeModel(os.getenv('GEMINI_MODEL', 'gemini-1.5-flash'))
         
         test_prompt = "Please respond with just the word 'SUCCESS' if you can read this."
         response = model.generate_content(test_prompt)
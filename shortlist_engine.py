@@ -0,0 +1,278 @@
+import re
+from array import array
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: the same columns are aggregated with plain loops
+    np = None
+
+from codec import decode_profile
+
+ERROR_RESULT = (False, "Error in evaluation")
+
+# End month of a role that is still ongoing; replaced by the current month at evaluation
+PRESENT = -1
+
+# Larger than any month index (year 9999), so owner * SPAN + month sorts by owner first
+SPAN = 12 * 10000
+
+WORD = re.compile(r'\w+')
+
+
+class PhraseMatcher:
+    """Case-insensitive whole-word matching against a fixed set of phrases
+
+    Single-word phrases are looked up in a token set; multi-word phrases are
+    compiled into one regex. Either way a text is scanned once, however many
+    phrases there are, and a phrase only matches whole words, so 'us' no
+    longer matches inside 'australia' nor 'meta' inside 'metadata'.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        normalized = {' '.join(WORD.findall(phrase.lower())) for phrase in phrases}
+        normalized.discard('')
+        self.phrases = tuple(sorted(normalized))
+        self._words = frozenset(p for p in self.phrases if ' ' not in p)
+        multi_word = sorted((p for p in self.phrases if ' ' in p), key=len, reverse=True)
+        self._pattern = re.compile(
+            r'(?<!\w)(?:' + '|'.join(r'\W+'.join(map(re.escape, p.split())) for p in multi_word) + r')(?!\w)'
+        ) if multi_word else None
+
+    def matches(self, text: str) -> bool:
+        text = text.lower()
+        if not self._words.isdisjoint(WORD.findall(text)):
+            return True
+        return self._pattern is not None and self._pattern.search(text) is not None
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(phrases: Tuple[str, ...]) -> PhraseMatcher:
+    return PhraseMatcher(phrases)
+
+
+def phrase_matcher(phrases: Iterable[str]) -> PhraseMatcher:
+    """Shared matcher for a phrase list, compiled on first use"""
+    return _cached_matcher(tuple(phrases))
+
+
+@lru_cache(maxsize=8192)
+def _parse_month(value: str) -> Optional[int]:
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        parse = date.fromisoformat
+    else:
+        # strptime also takes unpadded dates like 2018-3-5
+        parse = lambda text: datetime.strptime(text, '%Y-%m-%d')
+    try:
+        parsed = parse(value)
+    except ValueError:
+        return None
+    return parsed.year * 12 + parsed.month - 1
+
+
+def month_index(value: str) -> int:
+    """Months since year 0 of a YYYY-MM-DD date; raises ValueError like strptime
+
+    Experience dates repeat heavily across applicants, so parses are cached.
+    """
+    month = _parse_month(value)
+    if month is None:
+        raise ValueError(f"Invalid date: {value!r}")
+    return month
+
+
+def tenures_of(experience: List[Dict]) -> List[Tuple[int, int]]:
+    """(start, end) month indexes of the roles whose dates parse; end is PRESENT for ongoing roles"""
+    tenures = []
+    for exp in experience:
+        try:
+            start = month_index(exp.get('start', ''))
+            end_str = exp.get('end', '')
+            end = month_index(end_str) if end_str and end_str.lower() != 'present' else PRESENT
+        except ValueError:
+            continue
+        tenures.append((start, end))
+    return tenures
+
+
+def merged_months(tenures: Iterable[Tuple[int, int]], now_month: int) -> int:
+    """Months covered by at least one tenure, so overlapping roles are counted once"""
+    total = 0
+    covered = None
+    for start, end in sorted((start, now_month if end == PRESENT else end) for start, end in tenures):
+        if covered is not None:
+            start = max(start, covered)
+        if end > start:
+            total += end - start
+        covered = end if covered is None else max(covered, end)
+    return total
+
+
+class ProfileColumns:
+    """Compressed profiles flattened into column arrays for bulk shortlist evaluation
+
+    Built once from (key, compressed JSON) pairs; evaluate() can then be called
+    for any rule set without re-parsing. Company and location strings are
+    matched once per distinct value, and per-applicant totals, with overlapping
+    roles merged, are aggregated over whole columns. Results match evaluate_shortlist_criteria
+    in main.py applicant for applicant.
+    """
+
+    def __init__(self, profiles: Iterable[Tuple[str, str]]):
+        self.keys: List[str] = []
+        self.errors = array('b')
+        # Raw values are kept for the reason text, which prints them as stored
+        self.rates: List = []
+        self.availability: List = []
+        self.location_codes = array('l')
+        self.locations: List[str] = ['']
+        # One row per experience entry whose dates parse
+        self.tenure_owner = array('l')
+        self.tenure_start = array('l')
+        self.tenure_end = array('l')
+        # One row per experience entry
+        self.company_owner = array('l')
+        self.company_codes = array('l')
+        self.companies: List[str] = []
+
+        location_index = {'': 0}
+        company_index: Dict[str, int] = {}
+
+        for key, compressed_json in profiles:
+            owner = len(self.keys)
+            self.keys.append(key)
+            try:
+                rate, availability, location, tenures, companies = self._parse(compressed_json)
+            except Exception:
+                self.errors.append(1)
+                self.rates.append(0)
+                self.availability.append(0)
+                self.location_codes.append(0)
+                continue
+
+            self.errors.append(0)
+            self.rates.append(rate)
+            self.availability.append(availability)
+            self.location_codes.append(location_index.setdefault(location, len(location_index)))
+            for start, end in tenures:
+                self.tenure_owner.append(owner)
+                self.tenure_start.append(start)
+                self.tenure_end.append(end)
+            for company in companies:
+                self.company_owner.append(owner)
+                self.company_codes.append(company_index.setdefault(company, len(company_index)))
+
+        self.locations = list(location_index)
+        self.companies = list(company_index)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @staticmethod
+    def _parse(compressed_json: str) -> tuple:
+        """Extract one profile's columns, failing wherever the per-applicant evaluation would"""
+        data = decode_profile(compressed_json)
+        experience = data.get('experience', [])
+        tenures = tenures_of(experience)
+        companies = [exp.get('company', '').lower() for exp in experience]
+
+        salary = data.get('salary', {})
+        rate = salary.get('preferred_rate', 0)
+        availability = salary.get('availability', 0)
+
+        location = data.get('personal', {}).get('location', '').lower()
+        return rate, availability, location, tenures, companies
+
+    def evaluate(self, rules: Dict, now: datetime = None) -> Dict[str, Tuple[bool, str]]:
+        """Key -> (passed, reason) for every profile
+
+        rules holds tier1_companies, qualified_locations, min_experience_years,
+        max_hourly_rate and min_availability_hours.
+        """
+        count = len(self.keys)
+        now = now or datetime.now()
+        now_month = now.year * 12 + now.month - 1
+
+        tier1 = phrase_matcher(rules['tier1_companies'])
+        qualified = phrase_matcher(rules['qualified_locations'])
+        tier1_flags = [tier1.matches(company) for company in self.companies]
+        location_flags = [qualified.matches(location) for location in self.locations]
+
+        if np is not None:
+            total_months, has_tier1, located = self._aggregate_numpy(count, now_month, tier1_flags, location_flags)
+        else:
+            total_months, has_tier1, located = self._aggregate(count, now_month, tier1_flags, location_flags)
+
+        min_years = rules['min_experience_years']
+        max_rate = rules['max_hourly_rate']
+        min_availability = rules['min_availability_hours']
+
+        results = {}
+        for index, key in enumerate(self.keys):
+            if self.errors[index]:
+                results[key] = ERROR_RESULT
+                continue
+
+            reasons = []
+            experience_years = total_months[index] / 12.0
+            experience_passed = experience_years >= min_years or has_tier1[index]
+            if experience_passed:
+                if experience_years >= min_years:
+                    reasons.append(f"{experience_years:.1f} years experience")
+                if has_tier1[index]:
+                    reasons.append("Tier-1 company experience")
+
+            rate, availability = self.rates[index], self.availability[index]
+            compensation_passed = rate <= max_rate and availability >= min_availability
+            if compensation_passed:
+                reasons.append(f"Rate ${rate}/hr, {availability}hrs/week available")
+
+            location_passed = located[index]
+            if location_passed:
+                reasons.append(f"Located in {self.locations[self.location_codes[index]]}")
+
+            passed = bool(experience_passed and compensation_passed and location_passed)
+            results[key] = (passed, f"{'QUALIFIED' if passed else 'NOT QUALIFIED'}: {'; '.join(reasons)}")
+
+        return results
+
+    def _aggregate_numpy(self, count: int, now_month: int, tier1_flags: List[bool],
+                         location_flags: List[bool]) -> tuple:
+        owner = np.asarray(self.tenure_owner, dtype=np.int64)
+        start = np.asarray(self.tenure_start, dtype=np.int64)
+        end = np.asarray(self.tenure_end, dtype=np.int64)
+        end = np.maximum(np.where(end == PRESENT, now_month, end), start)
+
+        # Sort every applicant's tenures by start, keeping applicants apart, then
+        # count each tenure only past the furthest end reached before it
+        start = start + owner * SPAN
+        end = end + owner * SPAN
+        order = np.argsort(start, kind='stable')
+        owner, start, end = owner[order], start[order], end[order]
+        covered = np.concatenate(([np.iinfo(np.int64).min], np.maximum.accumulate(end)[:-1]))
+        months = np.maximum(end - np.maximum(start, covered), 0)
+        total_months = np.bincount(owner.astype(np.intp), weights=months, minlength=count)
+
+        company_tier1 = np.asarray(tier1_flags, dtype=bool)[np.asarray(self.company_codes, dtype=np.intp)]
+        has_tier1 = np.bincount(np.asarray(self.company_owner, dtype=np.intp), weights=company_tier1,
+                                minlength=count) > 0
+
+        located = np.asarray(location_flags, dtype=bool)[np.asarray(self.location_codes, dtype=np.intp)]
+        return total_months.astype(np.int64).tolist(), has_tier1.tolist(), located.tolist()
+
+    def _aggregate(self, count: int, now_month: int, tier1_flags: List[bool], location_flags: List[bool]) -> tuple:
+        total_months = [0] * count
+        rows = zip(self.tenure_owner, self.tenure_start, self.tenure_end)
+        for owner, tenures in groupby(rows, key=lambda row: row[0]):
+            total_months[owner] = merged_months(((start, end) for _, start, end in tenures), now_month)
+
+        has_tier1 = [False] * count
+        for owner, code in zip(self.company_owner, self.company_codes):
+            if tier1_flags[code]:
+                has_tier1[owner] = True
+
+        located = [location_flags[code] for code in self.location_codes]
+        return total_months, has_tier1, located
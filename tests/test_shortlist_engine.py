@@ -0,0 +1,133 @@
+import json
+import logging
+import random
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import main
+import shortlist_engine
+from shortlist_engine import (PRESENT, PhraseMatcher, ProfileColumns, _parse_month, merged_months, month_index,
+                              tenures_of)
+
+NOW = datetime(2026, 10, 15)
+NOW_MONTH = 2026 * 12 + 9
+
+COMPANIES = ['Google', 'Meta Platforms', 'metadata labs', 'Acme Corp', 'OpenAI', 'Stripe, Inc.', '', 'Initech']
+LOCATIONS = ['San Francisco, US', 'New York, USA', 'Sydney, Australia', 'London, United Kingdom', 'Toronto',
+             'Berlin, Germany', 'Lagos, Nigeria', 'united  states', '']
+DATES = ['2015-01-01', '2016-6-15', '2018-03-01', '2019-12-31', '2020-02-29', '2022-07-01', '2025-11-30',
+         'Present', 'present', '', 'not a date', '2021-13-01']
+RATES = [40, 75.5, 100, 100.01, 150, 0]
+AVAILABILITY = [10, 19.5, 20, 25, 40]
+
+
+def random_profile(rng: random.Random) -> str:
+    experience = []
+    for _ in range(rng.randint(0, 4)):
+        role = {'company': rng.choice(COMPANIES), 'title': 'Engineer',
+                'start': rng.choice(DATES[:7] + ['not a date']), 'end': rng.choice(DATES)}
+        experience.append(role)
+    profile = {'personal': {'name': 'Test', 'location': rng.choice(LOCATIONS)}, 'experience': experience,
+               'salary': {'preferred_rate': rng.choice(RATES), 'availability': rng.choice(AVAILABILITY)}}
+    for section in ('personal', 'experience', 'salary'):
+        if rng.random() < 0.05:
+            del profile[section]
+    return json.dumps(profile)
+
+
+def setUpModule():
+    # Malformed profiles are logged as errors; keep them out of mercor_system.log
+    logging.disable(logging.CRITICAL)
+
+
+def tearDownModule():
+    logging.disable(logging.NOTSET)
+
+
+class BulkEquivalenceTest(unittest.TestCase):
+    """ProfileColumns gives evaluate_shortlist_criteria's answer for every applicant"""
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(7)
+        cls.profiles = [(f"rec{i}", random_profile(rng)) for i in range(500)]
+        cls.profiles += [('bad-json', '{"experience": ['), ('not-an-object', '[]'),
+                         ('bad-rate', json.dumps({'salary': {'preferred_rate': 'fifty'}})),
+                         ('empty', '{}')]
+
+        system = main.MercorAirtableSystem.__new__(main.MercorAirtableSystem)
+        system.reference_now = NOW
+        cls.expected = {key: system.evaluate_shortlist_criteria(profile) for key, profile in cls.profiles}
+
+    def assertMatchesPerApplicant(self):
+        results = ProfileColumns(self.profiles).evaluate(main.SHORTLIST_RULES, NOW)
+        self.assertEqual(results, self.expected)
+        self.assertTrue(any(passed for passed, _ in results.values()))
+
+    @unittest.skipIf(shortlist_engine.np is None, "numpy not installed")
+    def test_numpy_aggregation(self):
+        self.assertMatchesPerApplicant()
+
+    def test_plain_aggregation(self):
+        with mock.patch.object(shortlist_engine, 'np', None):
+            self.assertMatchesPerApplicant()
+
+
+class PhraseMatcherTest(unittest.TestCase):
+    def test_single_words_match_whole_words_only(self):
+        matcher = PhraseMatcher(['US', 'meta'])
+        self.assertTrue(matcher.matches('Austin, US'))
+        self.assertTrue(matcher.matches('Meta Platforms'))
+        self.assertFalse(matcher.matches('Sydney, Australia'))
+        self.assertFalse(matcher.matches('Metadata Labs'))
+        self.assertFalse(matcher.matches('Status Inc'))
+
+    def test_multi_word_phrases_match_across_spacing_and_punctuation(self):
+        matcher = PhraseMatcher(['united states', 'united kingdom'])
+        self.assertTrue(matcher.matches('Boston, United  States'))
+        self.assertTrue(matcher.matches('UNITED-KINGDOM'))
+        self.assertFalse(matcher.matches('United Statesman'))
+        self.assertFalse(matcher.matches('united'))
+
+    def test_empty_phrases_never_match(self):
+        matcher = PhraseMatcher(['', '  '])
+        self.assertEqual(matcher.phrases, ())
+        self.assertFalse(matcher.matches('anything'))
+
+
+class TenureTest(unittest.TestCase):
+    def test_overlapping_and_nested_roles_count_once(self):
+        # Jan 2018 to Jan 2020, overlapped by Jan 2019 to Jan 2021, with a role nested in the first
+        tenures = [(24216, 24240), (24228, 24252), (24220, 24224)]
+        self.assertEqual(merged_months(tenures, NOW_MONTH), 36)
+
+    def test_gaps_and_adjacent_roles_add_up(self):
+        self.assertEqual(merged_months([(100, 112), (112, 118), (130, 136)], NOW_MONTH), 24)
+
+    def test_present_roles_run_to_now(self):
+        self.assertEqual(merged_months([(NOW_MONTH - 30, PRESENT)], NOW_MONTH), 30)
+        self.assertEqual(merged_months([(NOW_MONTH - 30, PRESENT), (NOW_MONTH - 40, NOW_MONTH - 20)], NOW_MONTH), 40)
+
+    def test_roles_ending_before_they_start_add_nothing(self):
+        self.assertEqual(merged_months([(120, 100), (90, 96)], NOW_MONTH), 6)
+        self.assertEqual(merged_months([], NOW_MONTH), 0)
+
+    def test_tenures_of_skips_unparseable_dates(self):
+        experience = [{'start': '2019-01-01', 'end': 'Present'}, {'start': '2016-3-5', 'end': '2017-03-05'},
+                      {'start': '2020-01-01', 'end': ''}, {'start': 'soon', 'end': '2021-01-01'},
+                      {'start': '2018-01-01', 'end': '2018-02-30'}]
+        self.assertEqual(tenures_of(experience),
+                         [(2019 * 12, PRESENT), (2016 * 12 + 2, 2017 * 12 + 2), (2020 * 12, PRESENT)])
+
+    def test_parse_month(self):
+        self.assertEqual(_parse_month('2020-02-29'), 2020 * 12 + 1)
+        self.assertEqual(_parse_month('2016-6-15'), 2016 * 12 + 5)
+        self.assertIsNone(_parse_month('2021-02-29'))
+        self.assertIsNone(_parse_month('Present'))
+        with self.assertRaises(ValueError):
+            month_index('')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import logging
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+import main
+from fake_airtable import FakeAirtable, FakeAirtableServer
+
+
+def setUpModule():
+    # Failed sends are logged as errors; keep them out of mercor_system.log
+    logging.disable(logging.CRITICAL)
+
+
+def tearDownModule():
+    logging.disable(logging.NOTSET)
+
+
+class WriteBufferTest(unittest.TestCase):
+    """AirtableWriteBuffer against fake_airtable, with failures injected"""
+
+    def setUp(self):
+        self.base = FakeAirtable(seed=1)
+        self.base.seed_applicants(15)
+        self.server = FakeAirtableServer(self.base).start()
+        self.addCleanup(self.server.stop)
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+
+        for patcher in (
+            mock.patch.dict(os.environ, {'AIRTABLE_TOKEN': 'test', 'AIRTABLE_BASE_ID': 'appTest'}),
+            mock.patch.object(main, 'AIRTABLE_API_URL', f"{self.server.api_root}/appTest"),
+            mock.patch.dict(main.LLM_BACKEND_SETTINGS, backend='fake'),
+            mock.patch.dict(main.LLM_CACHE_SETTINGS, enabled=False),
+            mock.patch.dict(main.RUN_STATE_SETTINGS, path=os.path.join(state_dir.name, 'run_state.sqlite3')),
+            mock.patch.dict(main.METRICS_SETTINGS, http_port=0),
+            mock.patch.object(main.time, 'sleep'),  # retry backoff
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.system = main.MercorAirtableSystem()
+        self.system.rate_limiter = main.RateLimiter(10 ** 6)
+        self.applicants = self.base.tables['Applicants']
+        self.record_ids = sorted(self.applicants)
+        self.unavailable = False
+
+        handle = self.base.handle
+
+        def handle_with_outage(method, table_name, record_id, query, body):
+            if self.unavailable and method != 'GET':
+                return 503, {'error': 'SERVICE_UNAVAILABLE'}
+            return handle(method, table_name, record_id, query, body)
+
+        self.base.handle = handle_with_outage
+
+    def status(self, record_id: str):
+        return self.applicants[record_id].fields.get('Shortlist Status')
+
+    def test_updates_are_merged_and_sent(self):
+        buffer = main.AirtableWriteBuffer(self.system)
+        for record_id in self.record_ids:
+            buffer.update('Applicants', record_id, {'Shortlist Status': 'Shortlisted'})
+            buffer.update('Applicants', record_id, {'LLM Score': 7})
+        buffer.flush()
+
+        self.assertEqual(buffer.pending(), 0)
+        self.assertEqual(self.base.stats['by_method']['PATCH'], 2)
+        for record_id in self.record_ids:
+            self.assertEqual(self.status(record_id), 'Shortlisted')
+            self.assertEqual(self.applicants[record_id].fields['LLM Score'], 7)
+
+    def test_rejected_record_is_dropped_and_the_rest_sent(self):
+        deleted = self.record_ids[3]
+        del self.applicants[deleted]  # PATCHing a deleted row fails with a 404
+
+        buffer = main.AirtableWriteBuffer(self.system)
+        for record_id in self.record_ids:
+            buffer.update('Applicants', record_id, {'Shortlist Status': 'Shortlisted'}, key=f"key-{record_id}")
+        buffer.flush()
+
+        self.assertEqual(buffer.pending(), 0)
+        self.assertEqual(buffer.rejected, 1)
+        self.assertEqual(buffer.failed, {f"key-{deleted}"})
+        for record_id in self.record_ids:
+            if record_id != deleted:
+                self.assertEqual(self.status(record_id), 'Shortlisted')
+
+        # Later writes aren't held up by the rejected record
+        buffer.update('Applicants', self.record_ids[0], {'Shortlist Status': 'Not Qualified'})
+        buffer.flush()
+        self.assertEqual(self.status(self.record_ids[0]), 'Not Qualified')
+
+    def test_retryable_failure_keeps_writes_queued(self):
+        buffer = main.AirtableWriteBuffer(self.system)
+        self.unavailable = True
+        with self.assertRaises(requests.exceptions.HTTPError):
+            for record_id in self.record_ids:
+                buffer.update('Applicants', record_id, {'Shortlist Status': 'Shortlisted'}, key=record_id)
+        self.assertEqual(buffer.pending(), main.AIRTABLE_BATCH_SIZE + 1)
+        buffer.create('Shortlisted Leads', {'Applicant': [self.record_ids[0]]}, key=self.record_ids[0])
+        with self.assertRaises(requests.exceptions.HTTPError):
+            buffer.flush()
+
+        self.unavailable = False
+        buffer.flush()
+        self.assertEqual(buffer.pending(), 0)
+        self.assertEqual(buffer.failed, set())
+        self.assertEqual(len(self.base.tables['Shortlisted Leads']), 1)
+        self.assertEqual(self.status(self.record_ids[0]), 'Shortlisted')
+
+    def test_buffered_writes_raises_after_sending_the_rest(self):
+        deleted = self.record_ids[0]
+        del self.applicants[deleted]
+
+        with self.assertRaises(main.WritesRejectedError):
+            with self.system.buffered_writes():
+                for record_id in self.record_ids[:3]:
+                    self.system.update_record('Applicants', record_id, {'Shortlist Status': 'Shortlisted'})
+        self.assertEqual([self.status(r) for r in self.record_ids[1:3]], ['Shortlisted', 'Shortlisted'])
+
+
+if __name__ == '__main__':
+    unittest.main()